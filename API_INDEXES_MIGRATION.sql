@@ -0,0 +1,161 @@
+-- ================================================
+-- API INDEXES
+-- ================================================
+-- Secondary indexes for the access paths the two APIs actually use:
+--   * every listing orders by created_at DESC (keyset pages add id)
+--   * GET /api/courses filters on subject, is_published, is_featured, price
+--   * the direct-SQL exports read updated_at >= ? ORDER BY updated_at, id
+--   * course_modules / course_topics are read by parent (and cascade on delete)
+--
+-- Idempotent: every index is CREATE INDEX IF NOT EXISTS, and an index is
+-- skipped (with a NOTICE) when its table or one of its columns does not
+-- exist, since the schema files in this repo differ slightly per table.
+-- Run in the Supabase SQL Editor; verify with explain_api_queries.py.
+--
+-- Plain CREATE INDEX blocks writes to the table while it builds. On a
+-- large live table, create that index by hand with CREATE INDEX
+-- CONCURRENTLY first (outside a transaction); this file then skips it.
+
+CREATE OR REPLACE FUNCTION pg_temp.create_api_index(
+    index_name TEXT,
+    target_table TEXT,
+    definition TEXT,
+    required_columns TEXT[]
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    missing TEXT[];
+BEGIN
+    SELECT array_agg(required.col) INTO missing
+    FROM unnest(required_columns) AS required(col)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM information_schema.columns c
+        WHERE c.table_schema = 'public'
+          AND c.table_name = target_table
+          AND c.column_name = required.col
+    );
+
+    IF missing IS NOT NULL THEN
+        RAISE NOTICE 'Skipping %: public.% is missing %', index_name, target_table, missing;
+        RETURN;
+    END IF;
+
+    EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON public.%I %s', index_name, target_table, definition);
+END;
+$$;
+
+-- ================================================
+-- 1. COURSES
+-- ================================================
+-- Default listing (order=created_at.desc) and keyset pages (created_at, id)
+SELECT pg_temp.create_api_index('idx_courses_created_at_id', 'courses',
+    '(created_at DESC, id DESC)', ARRAY['created_at', 'id']);
+
+-- ?subject=Mathematics, newest first
+SELECT pg_temp.create_api_index('idx_courses_subject_created_at', 'courses',
+    '(subject, created_at DESC, id DESC)', ARRAY['subject', 'created_at', 'id']);
+
+-- ?published=true listings (the public catalog)
+SELECT pg_temp.create_api_index('idx_courses_published_created_at', 'courses',
+    '(created_at DESC, id DESC) WHERE is_published', ARRAY['is_published', 'created_at', 'id']);
+
+-- ?featured=true listings (home page rails)
+SELECT pg_temp.create_api_index('idx_courses_featured_created_at', 'courses',
+    '(created_at DESC, id DESC) WHERE is_featured', ARRAY['is_featured', 'created_at', 'id']);
+
+-- min_price / max_price ranges
+SELECT pg_temp.create_api_index('idx_courses_price', 'courses',
+    '(price)', ARRAY['price']);
+
+-- Incremental exports and sync (updated_at >= ? ORDER BY updated_at, id)
+SELECT pg_temp.create_api_index('idx_courses_updated_at_id', 'courses',
+    '(updated_at, id)', ARRAY['updated_at', 'id']);
+
+-- ================================================
+-- 2. COURSE MODULES / TOPICS
+-- ================================================
+-- CORRECT_DATABASE_SCHEMA.sql orders modules by module_order and topics by
+-- topic_order
+SELECT pg_temp.create_api_index('idx_course_modules_course_order', 'course_modules',
+    '(course_id, module_order)', ARRAY['course_id', 'module_order']);
+
+SELECT pg_temp.create_api_index('idx_course_topics_module_order', 'course_topics',
+    '(module_id, topic_order)', ARRAY['module_id', 'topic_order']);
+
+-- FRONTEND_EXACT_SCHEMA.sql / CLEAN_SCHEMA_FOR_SUPABASE.sql order modules
+-- by module_number and topics by order_in_module
+SELECT pg_temp.create_api_index('idx_course_modules_course_number', 'course_modules',
+    '(course_id, module_number)', ARRAY['course_id', 'module_number']);
+
+SELECT pg_temp.create_api_index('idx_course_topics_module_position', 'course_topics',
+    '(module_id, order_in_module)', ARRAY['module_id', 'order_in_module']);
+
+-- ================================================
+-- 3. BLOG POSTS
+-- ================================================
+SELECT pg_temp.create_api_index('idx_blog_posts_created_at', 'blog_posts',
+    '(created_at DESC)', ARRAY['created_at']);
+
+SELECT pg_temp.create_api_index('idx_blog_posts_published_created_at', 'blog_posts',
+    '(created_at DESC) WHERE is_published', ARRAY['is_published', 'created_at']);
+
+SELECT pg_temp.create_api_index('idx_blog_posts_updated_at_id', 'blog_posts',
+    '(updated_at, id)', ARRAY['updated_at', 'id']);
+
+-- ================================================
+-- 4. TESTIMONIALS
+-- ================================================
+SELECT pg_temp.create_api_index('idx_testimonials_created_at', 'testimonials',
+    '(created_at DESC)', ARRAY['created_at']);
+
+SELECT pg_temp.create_api_index('idx_testimonials_featured_created_at', 'testimonials',
+    '(created_at DESC) WHERE is_featured', ARRAY['is_featured', 'created_at']);
+
+SELECT pg_temp.create_api_index('idx_testimonials_updated_at_id', 'testimonials',
+    '(updated_at, id)', ARRAY['updated_at', 'id']);
+
+-- ================================================
+-- 5. JOBS
+-- ================================================
+SELECT pg_temp.create_api_index('idx_jobs_created_at', 'jobs',
+    '(created_at DESC)', ARRAY['created_at']);
+
+SELECT pg_temp.create_api_index('idx_jobs_published_created_at', 'jobs',
+    '(created_at DESC) WHERE is_published', ARRAY['is_published', 'created_at']);
+
+SELECT pg_temp.create_api_index('idx_jobs_updated_at_id', 'jobs',
+    '(updated_at, id)', ARRAY['updated_at', 'id']);
+
+-- ================================================
+-- 6. INSTAGRAM POSTS
+-- ================================================
+SELECT pg_temp.create_api_index('idx_instagram_posts_created_at', 'instagram_posts',
+    '(created_at DESC)', ARRAY['created_at']);
+
+-- ================================================
+-- 7. STATISTICS
+-- ================================================
+DO $$
+DECLARE
+    target_table TEXT;
+BEGIN
+    FOREACH target_table IN ARRAY ARRAY[
+        'courses', 'course_modules', 'course_topics', 'blog_posts',
+        'testimonials', 'jobs', 'instagram_posts'
+    ] LOOP
+        IF to_regclass('public.' || target_table) IS NOT NULL THEN
+            EXECUTE format('ANALYZE public.%I', target_table);
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- ================================================
+-- 8. VERIFY
+-- ================================================
+SELECT tablename, indexname, indexdef
+FROM pg_indexes
+WHERE schemaname = 'public' AND indexname LIKE 'idx_%'
+ORDER BY tablename, indexname;
@@ -0,0 +1,104 @@
+-- ================================================
+-- COURSE FULL-TEXT SEARCH
+-- ================================================
+-- Replaces the leading-wildcard double ILIKE over title and description
+-- with a ranked search served by GIN indexes. Run in the Supabase SQL
+-- Editor after CORRECT_DATABASE_SCHEMA.sql; safe to run again.
+--
+-- optimized_ai_boss_admin.py calls it as
+--   GET /rest/v1/rpc/search_courses?q=...&min_price=...&max_price=...&result_limit=50&result_offset=0
+-- (price arguments only when filtering) and falls back to the ILIKE
+-- filter until this has been applied.
+
+-- ================================================
+-- 1. EXTENSIONS
+-- ================================================
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ================================================
+-- 2. SEARCH DOCUMENT
+-- ================================================
+-- Weighted document: title (A) > subject (B) > description (C).
+-- Indexed as an expression instead of a stored column, so the index is
+-- maintained by Postgres on every write and `select=*` responses do not
+-- carry a tsvector.
+CREATE OR REPLACE FUNCTION public.course_search_document(title TEXT, subject TEXT, description TEXT)
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english'::regconfig, coalesce(subject, '')), 'B')
+        || setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')
+$$;
+
+-- ================================================
+-- 3. INDEXES
+-- ================================================
+-- Word search over the whole document
+CREATE INDEX IF NOT EXISTS idx_courses_search_document
+    ON public.courses USING GIN (public.course_search_document(title, subject, description));
+
+-- Partial words and typos in titles ("calc", "trigonometery")
+CREATE INDEX IF NOT EXISTS idx_courses_title_trgm
+    ON public.courses USING GIN (title gin_trgm_ops);
+
+-- ================================================
+-- 4. SEARCH RPC
+-- ================================================
+-- Matches the document (web search syntax: "quoted phrases", or, -not)
+-- or a title substring, ranked by document relevance plus title
+-- similarity, newest first on ties.
+
+CREATE OR REPLACE FUNCTION public.search_courses(
+    q TEXT,
+    subject_filter TEXT DEFAULT NULL,
+    published_filter BOOLEAN DEFAULT NULL,
+    featured_filter BOOLEAN DEFAULT NULL,
+    min_price NUMERIC DEFAULT NULL,
+    max_price NUMERIC DEFAULT NULL,
+    result_limit INTEGER DEFAULT 50,
+    result_offset INTEGER DEFAULT 0
+)
+RETURNS SETOF public.courses
+LANGUAGE sql
+STABLE
+SET search_path = public, extensions
+AS $$
+    SELECT c.*
+    FROM public.courses c,
+         websearch_to_tsquery('english'::regconfig, q) AS query,
+         replace(replace(replace(q, '\', '\\'), '%', '\%'), '_', '\_') AS pattern
+    WHERE (public.course_search_document(c.title, c.subject, c.description) @@ query
+           OR c.title ILIKE '%' || pattern || '%')
+      AND (subject_filter IS NULL OR c.subject = subject_filter)
+      AND (published_filter IS NULL OR c.is_published = published_filter)
+      AND (featured_filter IS NULL OR c.is_featured = featured_filter)
+      AND (search_courses.min_price IS NULL OR c.price >= search_courses.min_price)
+      AND (search_courses.max_price IS NULL OR c.price <= search_courses.max_price)
+    ORDER BY ts_rank_cd(public.course_search_document(c.title, c.subject, c.description), query)
+             + similarity(c.title, q) DESC,
+             c.created_at DESC,
+             c.id DESC
+    LIMIT greatest(result_limit, 0)
+    OFFSET greatest(result_offset, 0)
+$$;
+
+GRANT EXECUTE ON FUNCTION public.course_search_document(TEXT, TEXT, TEXT) TO anon, authenticated, service_role;
+GRANT EXECUTE ON FUNCTION public.search_courses(TEXT, TEXT, BOOLEAN, BOOLEAN, NUMERIC, NUMERIC, INTEGER, INTEGER)
+    TO anon, authenticated, service_role;
+
+-- Make PostgREST pick up the new function right away
+NOTIFY pgrst, 'reload schema';
+
+-- ================================================
+-- 5. VERIFY
+-- ================================================
+-- On a large table the plan should use a BitmapOr over
+-- idx_courses_search_document and idx_courses_title_trgm, not a Seq Scan:
+-- EXPLAIN ANALYZE
+-- SELECT id FROM public.courses
+-- WHERE public.course_search_document(title, subject, description) @@ websearch_to_tsquery('english', 'calculus')
+--    OR title ILIKE '%calculus%';
+SELECT id, title FROM public.search_courses('mathematics', result_limit => 5);
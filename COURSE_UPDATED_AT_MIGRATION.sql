@@ -0,0 +1,42 @@
+-- ================================================
+-- COURSE updated_at TRIGGER
+-- ================================================
+-- courses.updated_at only has DEFAULT now(), so an UPDATE that does not
+-- set it (the SQL Editor, scripts, other services) leaves it unchanged.
+-- The course replica in optimized_ai_boss_admin.py polls
+-- updated_at >= watermark for changes and would miss such an edit until
+-- its next full sync (COURSE_REPLICA_FULL_SYNC_INTERVAL, 10 minutes by
+-- default). This trigger stamps every update. Run in the Supabase SQL
+-- Editor after CORRECT_DATABASE_SCHEMA.sql; safe to run again.
+--
+-- now() is the transaction start time; COURSE_REPLICA_SYNC_OVERLAP covers
+-- transactions that commit a few seconds after they started.
+
+-- ================================================
+-- 1. TRIGGER FUNCTION
+-- ================================================
+CREATE OR REPLACE FUNCTION public.set_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+-- ================================================
+-- 2. TRIGGER
+-- ================================================
+DROP TRIGGER IF EXISTS courses_set_updated_at ON public.courses;
+CREATE TRIGGER courses_set_updated_at
+    BEFORE UPDATE ON public.courses
+    FOR EACH ROW
+    EXECUTE FUNCTION public.set_updated_at();
+
+-- ================================================
+-- 3. VERIFY
+-- ================================================
+SELECT tgname, tgenabled
+FROM pg_trigger
+WHERE tgrelid = 'public.courses'::regclass AND tgname = 'courses_set_updated_at';
@@ -22,6 +22,7 @@ fi
 # Copy the new direct SQL version
 echo "📋 Installing new Direct SQL version..."
 cp /workspace/ai-boss-admin-vps/ai_boss_admin_direct_sql.py ./
+cp /workspace/ai-boss-admin-vps/http_common.py ./
 
 # Make sure it's executable
 chmod +x ai_boss_admin_direct_sql.py
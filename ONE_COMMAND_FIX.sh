@@ -68,6 +68,11 @@ if [[ ! -f "optimized_ai_boss_admin.py" ]]; then
     cp ~/ai-boss-admin-vps/optimized_ai_boss_admin.py .
 fi
 
+if [[ ! -f "http_common.py" ]]; then
+    print_warning "Shared HTTP helpers missing, copying..."
+    cp ~/ai-boss-admin-vps/http_common.py .
+fi
+
 if [[ ! -f ".env" ]]; then
     print_warning "Environment file missing, copying..."
     cp ~/ai-boss-admin-vps/.env.production .env
@@ -5,24 +5,76 @@ Bypasses Supabase client issues by using direct PostgreSQL queries
 """
 
 import os
+import csv
+import io
 import json
+import time
+import asyncio
+import functools
 import uuid
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
+import orjson
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extras import RealDictCursor
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 import logging
+from http_common import (
+    COMPRESSION_ENABLED, CompressionMiddleware, FastJSONResponse, FastJSONRoute, conditional_response, json_default
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Boss Admin - Direct SQL", version="2.0")
+# Connection pool configuration
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_CHECK_IDLE_AFTER = float(os.getenv("DB_POOL_CHECK_IDLE_AFTER", "30"))
+
+# Server-side prepared statements (disable behind a transaction-mode pooler)
+DB_PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+
+# Worker threads for blocking psycopg2 calls (defaults to the pool size)
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", str(DB_POOL_MAX_SIZE)))
+
+# Bulk inserts: rows per multi-row INSERT and per request
+DB_BULK_PAGE_SIZE = int(os.getenv("DB_BULK_PAGE_SIZE", "500"))
+DB_BULK_MAX_ROWS = int(os.getenv("DB_BULK_MAX_ROWS", "5000"))
+
+# Streaming exports: rows fetched per round trip from the server-side cursor
+DB_EXPORT_BATCH_SIZE = int(os.getenv("DB_EXPORT_BATCH_SIZE", "1000"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: warm the shared connection pool
+    try:
+        db_pool.open()
+        logger.info(f"Database pool ready: {db_pool.stats()}")
+    except Exception as e:
+        logger.error(f"Database pool warm-up failed (connections will be opened on demand): {str(e)}")
+    
+    yield
+    
+    # Shutdown
+    db_executor.shutdown()
+    db_pool.close()
+
+app = FastAPI(title="AI Boss Admin - Direct SQL", version="2.0", lifespan=lifespan,
+              default_response_class=FastJSONResponse)
+app.router.route_class = FastJSONRoute
 
 # CORS middleware
 app.add_middleware(
@@ -33,9 +85,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Database connection function
-def get_db_connection():
-    """Create database connection using environment variables"""
+# Compress list/export responses above COMPRESSION_MIN_SIZE
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Database connection functions
+def create_db_connection():
+    """Open a new database connection using environment variables"""
     try:
         # Extract database URL from SUPABASE_URL
         supabase_url = os.getenv('SUPABASE_URL')
@@ -55,6 +111,339 @@ def get_db_connection():
         logger.error(f"Database connection failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
 
+class DatabasePool:
+    """Thread-safe psycopg2 connection pool
+    
+    Connections are checked on borrow (pinged if idle longer than
+    check_idle_after seconds), recycled after max_lifetime seconds and
+    discarded if they come back broken.
+    """
+    
+    def __init__(
+        self,
+        connect: Callable = create_db_connection,
+        min_size: int = DB_POOL_MIN_SIZE,
+        max_size: int = DB_POOL_MAX_SIZE,
+        max_lifetime: float = DB_POOL_MAX_LIFETIME,
+        timeout: float = DB_POOL_TIMEOUT,
+        check_idle_after: float = DB_POOL_CHECK_IDLE_AFTER
+    ):
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.check_idle_after = check_idle_after
+        self._idle = deque()  # (conn, created_at, last_used)
+        self._created_at: Dict[int, float] = {}
+        self._size = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "borrowed": 0,
+            "returned": 0,
+            "created": 0,
+            "closed": 0,
+            "recycled": 0,
+            "health_check_failures": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_time_total": 0.0
+        }
+    
+    def open(self):
+        """Pre-create min_size connections"""
+        with self._cond:
+            missing = self.min_size - self._size
+            self._size += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            try:
+                conn = self._new_connection()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append((conn, self._created_at[id(conn)], time.monotonic()))
+                self._cond.notify()
+    
+    def close(self):
+        """Close every idle connection"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _, _ in idle:
+            self._discard(conn)
+    
+    def _new_connection(self):
+        conn = self._connect()
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats["created"] += 1
+        return conn
+    
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+            self._size -= 1
+            self._stats["closed"] += 1
+            self._cond.notify()
+    
+    def _is_healthy(self, conn, created_at: float, last_used: float) -> bool:
+        now = time.monotonic()
+        if conn.closed:
+            return False
+        if now - created_at > self.max_lifetime:
+            with self._cond:
+                self._stats["recycled"] += 1
+            return False
+        if now - last_used > self.check_idle_after:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except Exception:
+                with self._cond:
+                    self._stats["health_check_failures"] += 1
+                return False
+        return True
+    
+    def acquire(self):
+        """Borrow a healthy connection, waiting up to `timeout` seconds"""
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while True:
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise TimeoutError(f"No database connection available within {self.timeout}s")
+                    if not waited:
+                        self._stats["waits"] += 1
+                        waited = True
+                    started = time.monotonic()
+                    self._cond.wait(remaining)
+                    self._stats["wait_time_total"] += time.monotonic() - started
+                
+                if self._idle:
+                    conn, created_at, last_used = self._idle.pop()
+                else:
+                    conn = None
+                    self._size += 1
+            
+            if conn is None:
+                try:
+                    conn = self._new_connection()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(conn, created_at, last_used):
+                self._discard(conn)
+                continue
+            
+            with self._cond:
+                self._stats["borrowed"] += 1
+            return conn
+    
+    def release(self, conn, discard: bool = False):
+        """Return a borrowed connection to the pool"""
+        with self._cond:
+            self._stats["returned"] += 1
+        
+        broken = discard or conn.closed
+        if not broken and conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+        
+        created_at = self._created_at.get(id(conn), 0)
+        if broken or time.monotonic() - created_at > self.max_lifetime:
+            self._discard(conn)
+            return
+        
+        with self._cond:
+            self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commit on success, roll back on error"""
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                self.release(conn, discard=True)
+                raise
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "max_lifetime_seconds": self.max_lifetime
+            })
+        stats["wait_time_total"] = round(stats["wait_time_total"], 4)
+        return stats
+
+class DatabaseExecutor:
+    """Bounded thread pool that runs blocking psycopg2 work off the event loop
+    
+    The worker count caps how many queries run at once; extra calls wait
+    on the semaphore inside the event loop, where they can be cancelled.
+    N concurrent queries therefore take about ceil(N / max_workers) query
+    times (5 rounds for 50 calls with the default 10 workers).
+    """
+    
+    def __init__(self, max_workers: int = DB_EXECUTOR_WORKERS):
+        self.max_workers = max(max_workers, 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db")
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        self._in_flight = 0
+        self._waiting = 0
+        self._completed = 0
+    
+    async def run(self, func: Callable, *args, **kwargs):
+        """Run `func(*args, **kwargs)` in a worker thread and await the result"""
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+            self._semaphore.release()
+    
+    def submit(self, func: Callable, *args, **kwargs):
+        """Fire-and-forget `func` on a worker thread (cleanup that must not block the loop)"""
+        return self._executor.submit(func, *args, **kwargs)
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "completed": self._completed
+        }
+
+class StatementRegistry:
+    """Central registry of named SQL statements
+    
+    Each statement is defined once with psycopg2 %s placeholders. On first
+    use per pooled connection it is sent as PREPARE, and later calls on the
+    same connection only send EXECUTE with the parameters. Execution counts
+    and timings are kept per statement.
+    """
+    
+    def __init__(self, enabled: bool = DB_PREPARED_STATEMENTS):
+        self.enabled = enabled
+        self._statements: Dict[str, Dict[str, Any]] = {}
+        self._prepared = weakref.WeakKeyDictionary()  # connection -> set of names
+        self._lock = threading.Lock()
+    
+    def define(self, name: str, sql: str) -> str:
+        """Register `sql` under `name` and return the name"""
+        sql = sql.strip()
+        param_count = sql.count("%s")
+        numbered = sql
+        for i in range(1, param_count + 1):
+            numbered = numbered.replace("%s", f"${i}", 1)
+        
+        args = ", ".join(["%s"] * param_count)
+        self._statements[name] = {
+            "sql": sql,
+            "prepare": f"PREPARE {name} AS {numbered}",
+            "execute": f"EXECUTE {name} ({args})" if param_count else f"EXECUTE {name}",
+            "calls": 0,
+            "prepares": 0,
+            "total_time": 0.0,
+            "max_time": 0.0
+        }
+        return name
+    
+    def sql(self, name: str) -> str:
+        """The plain SQL (with %s placeholders) registered under `name`"""
+        return self._statements[name]["sql"]
+    
+    def execute(self, cur, name: str, params=None):
+        """Run a registered statement on `cur`, preparing it on first use"""
+        statement = self._statements[name]
+        started = time.perf_counter()
+        
+        if self.enabled:
+            conn = cur.connection
+            with self._lock:
+                prepared = self._prepared.setdefault(conn, set())
+            if name not in prepared:
+                cur.execute(statement["prepare"])
+                prepared.add(name)
+                with self._lock:
+                    statement["prepares"] += 1
+            cur.execute(statement["execute"], params)
+        else:
+            cur.execute(statement["sql"], params)
+        
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            statement["calls"] += 1
+            statement["total_time"] += elapsed
+            statement["max_time"] = max(statement["max_time"], elapsed)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    "calls": st["calls"],
+                    "prepares": st["prepares"],
+                    "total_ms": round(st["total_time"] * 1000, 3),
+                    "avg_ms": round(st["total_time"] * 1000 / st["calls"], 3) if st["calls"] else 0.0,
+                    "max_ms": round(st["max_time"] * 1000, 3)
+                }
+                for name, st in self._statements.items()
+            }
+
+db_pool = DatabasePool()
+db_executor = DatabaseExecutor()
+statements = StatementRegistry()
+
+@contextmanager
+def get_db_connection():
+    """Borrow a pooled database connection for the duration of a `with` block"""
+    try:
+        with db_pool.connection() as conn:
+            yield conn
+    except TimeoutError as e:
+        logger.error(f"Database pool exhausted: {str(e)}")
+        raise HTTPException(status_code=503, detail=f"Database connection unavailable: {str(e)}")
+
 # Pydantic models for request validation
 class BlogPost(BaseModel):
     title: str
@@ -129,6 +518,189 @@ class Job(BaseModel):
     category: Optional[str] = None
     industry: Optional[str] = None
 
+# ========================================
+# SQL STATEMENT REGISTRY
+# ========================================
+
+# Column order shared by the insert, bulk insert and export paths
+BLOG_POST_COLUMNS = (
+    "id", "title", "content", "excerpt", "author_name", "category",
+    "tags", "featured_image_url", "meta_title", "meta_description",
+    "is_published", "status", "created_at", "updated_at"
+)
+
+COURSE_COLUMNS = (
+    "id", "title", "description", "subject", "level", "grade_level",
+    "duration_weeks", "course_duration", "price", "target_audience",
+    "instructor_name", "course_image_url", "is_published", "is_featured",
+    "created_by", "created_at", "updated_at"
+)
+
+TESTIMONIAL_COLUMNS = (
+    "id", "client_name", "client_title", "client_company", "client_avatar_url",
+    "testimonial_text", "rating", "testimonial_type", "target_pages",
+    "display_order", "is_featured", "is_visible", "client_location",
+    "client_website", "project_details", "client_industry",
+    "verification_status", "created_at", "updated_at"
+)
+
+JOB_COLUMNS = (
+    "id", "title", "company_name", "company_logo_url", "location", "is_remote",
+    "employment_type", "experience_level", "salary_min", "salary_max",
+    "salary_currency", "salary_period", "description", "requirements",
+    "skills", "responsibilities", "benefits", "application_deadline",
+    "contact_email", "application_url", "application_instructions",
+    "is_featured", "is_active", "is_published", "category", "industry",
+    "created_at", "updated_at"
+)
+
+def insert_statement(table: str, columns, returning: Optional[str] = None, rows: int = 1) -> str:
+    """Build an INSERT with `rows` groups of %s placeholders"""
+    group = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([group] * rows)}"
+    if returning:
+        sql += f" RETURNING {returning}"
+    return sql
+
+def bulk_insert(cur, table: str, columns, rows: List[tuple], page_size: Optional[int] = None) -> int:
+    """Insert `rows` with one multi-row INSERT per page of `page_size` rows
+    
+    Runs inside the caller's transaction, so either every page lands on
+    commit or none do. Returns the number of rows inserted.
+    """
+    page_size = page_size or DB_BULK_PAGE_SIZE
+    inserted = 0
+    for start in range(0, len(rows), page_size):
+        page = rows[start:start + page_size]
+        params = [value for row in page for value in row]
+        cur.execute(insert_statement(table, columns, rows=len(page)), params)
+        inserted += len(page)
+    return inserted
+
+statements.define("create_blog_post", insert_statement(
+    "public.blog_posts", BLOG_POST_COLUMNS, returning="id, title, created_at"
+))
+
+statements.define("list_blog_posts", """
+    SELECT id, title, excerpt, author_name, category,
+           tags, is_published, status, created_at, updated_at
+    FROM public.blog_posts
+    ORDER BY created_at DESC
+    LIMIT %s
+""")
+
+statements.define("create_course", insert_statement(
+    "public.courses", COURSE_COLUMNS, returning="id, title, created_at"
+))
+
+statements.define("list_courses", """
+    SELECT id, title, description, subject, level, grade_level,
+           duration_weeks, course_duration, price, instructor_name,
+           is_published, is_featured, created_by, created_at, updated_at
+    FROM public.courses
+    ORDER BY created_at DESC
+    LIMIT %s
+""")
+
+statements.define("create_testimonial", insert_statement(
+    "public.testimonials", TESTIMONIAL_COLUMNS, returning="id, client_name, created_at"
+))
+
+statements.define("list_testimonials", """
+    SELECT id, client_name, client_title, client_company, testimonial_text,
+           rating, testimonial_type, is_featured, is_visible, created_at, updated_at
+    FROM public.testimonials
+    ORDER BY created_at DESC
+    LIMIT %s
+""")
+
+statements.define("create_job", insert_statement(
+    "public.jobs", JOB_COLUMNS, returning="id, title, created_at"
+))
+
+statements.define("list_jobs", """
+    SELECT id, title, company_name, location, employment_type,
+           is_remote, is_published, is_active, created_at, updated_at
+    FROM public.jobs
+    ORDER BY created_at DESC
+    LIMIT %s
+""")
+
+async def bulk_create(rows: List[Dict[str, Any]], model, build_values: Callable, table: str, columns, label: str):
+    """Validate each row, then insert every valid row in one transaction
+    
+    Rows that fail validation are reported by index with their errors and
+    skipped; the valid rows are committed together or not at all.
+    """
+    if len(rows) > DB_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Bulk insert limited to {DB_BULK_MAX_ROWS} rows per request")
+    
+    created_at = datetime.now()
+    results, values = [], []
+    for index, row in enumerate(rows):
+        try:
+            item = model.model_validate(row)
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+            results.append({"index": index, "success": False, "error": errors})
+            continue
+        row_id = str(uuid.uuid4())
+        values.append(build_values(item, row_id, created_at))
+        results.append({"index": index, "success": True, "id": row_id})
+    
+    def insert():
+        # The pooled connection commits once when the block exits
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                return bulk_insert(cur, table, columns, values)
+    
+    created = 0
+    if values:
+        try:
+            created = await db_executor.run(insert)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Bulk {label} creation failed: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to create {label}: {str(e)}")
+    
+    logger.info(f"Bulk created {created} {label} ({len(rows) - created} rejected)")
+    return {
+        "results": results,
+        "total": len(rows),
+        "created": created,
+        "failed": len(rows) - created,
+        "created_at": created_at,
+        "message": f"{created} {label} created in one transaction using direct SQL"
+    }
+
+async def list_rows(request: Optional[Request], statement: str, key: str, limit: int, label: str):
+    """Run a list statement and answer with a weak ETag
+    
+    Called over HTTP, an unchanged result is a bodiless 304. Called
+    directly (request None), the plain dict is returned.
+    """
+    def fetch():
+        with get_db_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                statements.execute(cur, statement, (limit,))
+                return [dict(row) for row in cur.fetchall()]
+    
+    try:
+        rows = await db_executor.run(fetch)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch {label}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch {label}: {str(e)}")
+    
+    content = {key: rows, "count": len(rows)}
+    if request is None:
+        return content
+    return conditional_response(request, content, rows, statement, limit)
+
 # Direct SQL API endpoints
 
 @app.get("/")
@@ -540,7 +1112,7 @@ async def admin_home():
 @app.post("/api/admin/blog")
 async def create_blog_post(blog: BlogPost):
     """Create blog post using direct SQL"""
-    try:
+    def insert():
         with get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Generate unique ID and timestamps
@@ -550,17 +1122,6 @@ async def create_blog_post(blog: BlogPost):
                 # Prepare tags array for PostgreSQL
                 tags_array = blog.tags if blog.tags else []
                 
-                # Insert blog post using direct SQL
-                query = """
-                    INSERT INTO public.blog_posts (
-                        id, title, content, excerpt, author_name, category, 
-                        tags, featured_image_url, meta_title, meta_description,
-                        is_published, status, created_at, updated_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    ) RETURNING id, title, created_at
-                """
-                
                 values = (
                     blog_id,
                     blog.title,
@@ -578,7 +1139,7 @@ async def create_blog_post(blog: BlogPost):
                     created_at
                 )
                 
-                cur.execute(query, values)
+                statements.execute(cur, "create_blog_post", values)
                 result = cur.fetchone()
                 conn.commit()
                 
@@ -586,38 +1147,22 @@ async def create_blog_post(blog: BlogPost):
                 return {
                     "id": result['id'],
                     "title": result['title'],
-                    "created_at": result['created_at'].isoformat(),
+                    "created_at": result['created_at'],
                     "message": "Blog post created successfully using direct SQL"
                 }
-                
+    
+    try:
+        return await db_executor.run(insert)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Blog creation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create blog post: {str(e)}")
 
 @app.get("/api/admin/blog")
-async def list_blog_posts(limit: int = Query(50, ge=1, le=100)):
+async def list_blog_posts(limit: int = Query(50, ge=1, le=100), request: Request = None):
     """Get all blog posts using direct SQL"""
-    try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                query = """
-                    SELECT id, title, excerpt, author_name, category, 
-                           tags, is_published, status, created_at, updated_at
-                    FROM public.blog_posts 
-                    ORDER BY created_at DESC 
-                    LIMIT %s
-                """
-                cur.execute(query, (limit,))
-                results = cur.fetchall()
-                
-                return {
-                    "blogs": [dict(row) for row in results],
-                    "count": len(results)
-                }
-                
-    except Exception as e:
-        logger.error(f"Failed to fetch blog posts: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to fetch blog posts: {str(e)}")
+    return await list_rows(request, "list_blog_posts", "blogs", limit, "blog posts")
 
 # ========================================
 # COURSES API ENDPOINTS (Direct SQL)
@@ -626,25 +1171,13 @@ async def list_blog_posts(limit: int = Query(50, ge=1, le=100)):
 @app.post("/api/admin/courses")
 async def create_course(course: Course):
     """Create course using direct SQL"""
-    try:
+    def insert():
         with get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Generate unique ID and timestamps
                 course_id = str(uuid.uuid4())
                 created_at = datetime.now()
                 
-                # Insert course using direct SQL
-                query = """
-                    INSERT INTO public.courses (
-                        id, title, description, subject, level, grade_level,
-                        duration_weeks, course_duration, price, target_audience,
-                        instructor_name, course_image_url, is_published, is_featured,
-                        created_by, created_at, updated_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    ) RETURNING id, title, created_at
-                """
-                
                 values = (
                     course_id,
                     course.title,
@@ -665,7 +1198,7 @@ async def create_course(course: Course):
                     created_at
                 )
                 
-                cur.execute(query, values)
+                statements.execute(cur, "create_course", values)
                 result = cur.fetchone()
                 conn.commit()
                 
@@ -673,93 +1206,67 @@ async def create_course(course: Course):
                 return {
                     "id": result['id'],
                     "title": result['title'],
-                    "created_at": result['created_at'].isoformat(),
+                    "created_at": result['created_at'],
                     "message": "Course created successfully using direct SQL"
                 }
-                
+    
+    try:
+        return await db_executor.run(insert)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Course creation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create course: {str(e)}")
 
 @app.get("/api/admin/courses")
-async def list_courses(limit: int = Query(50, ge=1, le=100)):
+async def list_courses(limit: int = Query(50, ge=1, le=100), request: Request = None):
     """Get all courses using direct SQL"""
-    try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                query = """
-                    SELECT id, title, description, subject, level, grade_level,
-                           duration_weeks, course_duration, price, instructor_name,
-                           is_published, is_featured, created_by, created_at, updated_at
-                    FROM public.courses 
-                    ORDER BY created_at DESC 
-                    LIMIT %s
-                """
-                cur.execute(query, (limit,))
-                results = cur.fetchall()
-                
-                return {
-                    "courses": [dict(row) for row in results],
-                    "count": len(results)
-                }
-                
-    except Exception as e:
-        logger.error(f"Failed to fetch courses: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to fetch courses: {str(e)}")
+    return await list_rows(request, "list_courses", "courses", limit, "courses")
 
 # ========================================
 # TESTIMONIALS API ENDPOINTS (Direct SQL)
 # ========================================
 
+def testimonial_values(testimonial: Testimonial, testimonial_id: str, created_at: datetime) -> tuple:
+    """Row values for TESTIMONIAL_COLUMNS"""
+    # Prepare target pages array
+    target_pages_array = testimonial.target_pages if testimonial.target_pages else ["homepage"]
+    
+    return (
+        testimonial_id,
+        testimonial.client_name,
+        testimonial.client_title,
+        testimonial.client_company,
+        testimonial.client_avatar_url,
+        testimonial.testimonial_text,
+        testimonial.rating or 5,
+        testimonial.testimonial_type or "general",
+        target_pages_array,
+        testimonial.display_order or 0,
+        testimonial.is_featured if testimonial.is_featured is not None else False,
+        testimonial.is_visible if testimonial.is_visible is not None else True,
+        testimonial.client_location,
+        testimonial.client_website,
+        testimonial.project_details,
+        testimonial.client_industry,
+        "pending",
+        created_at,
+        created_at
+    )
+
 @app.post("/api/admin/testimonials")
 async def create_testimonial(testimonial: Testimonial):
     """Create testimonial using direct SQL"""
-    try:
+    def insert():
         with get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Generate unique ID and timestamps
                 testimonial_id = str(uuid.uuid4())
                 created_at = datetime.now()
                 
-                # Prepare target pages array
-                target_pages_array = testimonial.target_pages if testimonial.target_pages else ["homepage"]
-                
-                # Insert testimonial using direct SQL
-                query = """
-                    INSERT INTO public.testimonials (
-                        id, client_name, client_title, client_company, client_avatar_url,
-                        testimonial_text, rating, testimonial_type, target_pages,
-                        display_order, is_featured, is_visible, client_location,
-                        client_website, project_details, client_industry,
-                        verification_status, created_at, updated_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    ) RETURNING id, client_name, created_at
-                """
+                values = testimonial_values(testimonial, testimonial_id, created_at)
                 
-                values = (
-                    testimonial_id,
-                    testimonial.client_name,
-                    testimonial.client_title,
-                    testimonial.client_company,
-                    testimonial.client_avatar_url,
-                    testimonial.testimonial_text,
-                    testimonial.rating or 5,
-                    testimonial.testimonial_type or "general",
-                    target_pages_array,
-                    testimonial.display_order or 0,
-                    testimonial.is_featured if testimonial.is_featured is not None else False,
-                    testimonial.is_visible if testimonial.is_visible is not None else True,
-                    testimonial.client_location,
-                    testimonial.client_website,
-                    testimonial.project_details,
-                    testimonial.client_industry,
-                    "pending",
-                    created_at,
-                    created_at
-                )
-                
-                cur.execute(query, values)
+                statements.execute(cur, "create_testimonial", values)
                 result = cur.fetchone()
                 conn.commit()
                 
@@ -767,106 +1274,84 @@ async def create_testimonial(testimonial: Testimonial):
                 return {
                     "id": result['id'],
                     "client_name": result['client_name'],
-                    "created_at": result['created_at'].isoformat(),
+                    "created_at": result['created_at'],
                     "message": "Testimonial created successfully using direct SQL"
                 }
-                
+    
+    try:
+        return await db_executor.run(insert)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Testimonial creation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create testimonial: {str(e)}")
 
+@app.post("/api/admin/testimonials/bulk")
+async def create_testimonials_bulk(rows: List[Dict[str, Any]]):
+    """Create many testimonials in one transaction using multi-row inserts"""
+    return await bulk_create(rows, Testimonial, testimonial_values, "public.testimonials", TESTIMONIAL_COLUMNS, "testimonials")
+
 @app.get("/api/admin/testimonials")
-async def list_testimonials(limit: int = Query(50, ge=1, le=100)):
+async def list_testimonials(limit: int = Query(50, ge=1, le=100), request: Request = None):
     """Get all testimonials using direct SQL"""
-    try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                query = """
-                    SELECT id, client_name, client_title, client_company, testimonial_text,
-                           rating, testimonial_type, is_featured, is_visible, created_at
-                    FROM public.testimonials 
-                    ORDER BY created_at DESC 
-                    LIMIT %s
-                """
-                cur.execute(query, (limit,))
-                results = cur.fetchall()
-                
-                return {
-                    "testimonials": [dict(row) for row in results],
-                    "count": len(results)
-                }
-                
-    except Exception as e:
-        logger.error(f"Failed to fetch testimonials: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to fetch testimonials: {str(e)}")
+    return await list_rows(request, "list_testimonials", "testimonials", limit, "testimonials")
 
 # ========================================
 # JOBS API ENDPOINTS (Direct SQL)
 # ========================================
 
+def job_values(job: Job, job_id: str, created_at: datetime) -> tuple:
+    """Row values for JOB_COLUMNS"""
+    # Prepare arrays
+    skills_array = job.skills if job.skills else []
+    requirements_array = job.requirements if job.requirements else []
+    responsibilities_array = job.responsibilities if job.responsibilities else []
+    benefits_array = job.benefits if job.benefits else []
+    
+    return (
+        job_id,
+        job.title,
+        job.company_name,
+        job.company_logo_url,
+        job.location,
+        job.is_remote if job.is_remote is not None else False,
+        job.employment_type or "full-time",
+        job.experience_level or "mid-level",
+        job.salary_min,
+        job.salary_max,
+        job.salary_currency or "USD",
+        job.salary_period or "year",
+        job.description,
+        requirements_array,
+        skills_array,
+        responsibilities_array,
+        benefits_array,
+        job.application_deadline,
+        job.contact_email,
+        job.application_url,
+        job.application_instructions,
+        job.is_featured if job.is_featured is not None else False,
+        job.is_active if job.is_active is not None else True,
+        job.is_published if job.is_published is not None else True,
+        job.category,
+        job.industry,
+        created_at,
+        created_at
+    )
+
 @app.post("/api/admin/jobs")
 async def create_job(job: Job):
     """Create job listing using direct SQL"""
-    try:
+    def insert():
         with get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Generate unique ID and timestamps
                 job_id = str(uuid.uuid4())
                 created_at = datetime.now()
                 
-                # Prepare arrays
-                skills_array = job.skills if job.skills else []
-                requirements_array = job.requirements if job.requirements else []
-                responsibilities_array = job.responsibilities if job.responsibilities else []
-                benefits_array = job.benefits if job.benefits else []
-                
-                # Insert job using direct SQL
-                query = """
-                    INSERT INTO public.jobs (
-                        id, title, company_name, company_logo_url, location, is_remote,
-                        employment_type, experience_level, salary_min, salary_max,
-                        salary_currency, salary_period, description, requirements,
-                        skills, responsibilities, benefits, application_deadline,
-                        contact_email, application_url, application_instructions,
-                        is_featured, is_active, is_published, category, industry,
-                        created_at, updated_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    ) RETURNING id, title, created_at
-                """
+                values = job_values(job, job_id, created_at)
                 
-                values = (
-                    job_id,
-                    job.title,
-                    job.company_name,
-                    job.company_logo_url,
-                    job.location,
-                    job.is_remote if job.is_remote is not None else False,
-                    job.employment_type or "full-time",
-                    job.experience_level or "mid-level",
-                    job.salary_min,
-                    job.salary_max,
-                    job.salary_currency or "USD",
-                    job.salary_period or "year",
-                    job.description,
-                    requirements_array,
-                    skills_array,
-                    responsibilities_array,
-                    benefits_array,
-                    job.application_deadline,
-                    job.contact_email,
-                    job.application_url,
-                    job.application_instructions,
-                    job.is_featured if job.is_featured is not None else False,
-                    job.is_active if job.is_active is not None else True,
-                    job.is_published if job.is_published is not None else True,
-                    job.category,
-                    job.industry,
-                    created_at,
-                    created_at
-                )
-                
-                cur.execute(query, values)
+                statements.execute(cur, "create_job", values)
                 result = cur.fetchone()
                 conn.commit()
                 
@@ -874,38 +1359,196 @@ async def create_job(job: Job):
                 return {
                     "id": result['id'],
                     "title": result['title'],
-                    "created_at": result['created_at'].isoformat(),
+                    "created_at": result['created_at'],
                     "message": "Job listing created successfully using direct SQL"
                 }
-                
+    
+    try:
+        return await db_executor.run(insert)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Job creation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create job listing: {str(e)}")
 
+@app.post("/api/admin/jobs/bulk")
+async def create_jobs_bulk(rows: List[Dict[str, Any]]):
+    """Create many job listings in one transaction using multi-row inserts"""
+    return await bulk_create(rows, Job, job_values, "public.jobs", JOB_COLUMNS, "job listings")
+
 @app.get("/api/admin/jobs")
-async def list_jobs(limit: int = Query(50, ge=1, le=100)):
+async def list_jobs(limit: int = Query(50, ge=1, le=100), request: Request = None):
     """Get all job listings using direct SQL"""
+    return await list_rows(request, "list_jobs", "jobs", limit, "jobs")
+
+# ========================================
+# STREAMING EXPORTS (Direct SQL)
+# ========================================
+
+EXPORT_TABLES = {
+    "blog": ("public.blog_posts", BLOG_POST_COLUMNS),
+    "courses": ("public.courses", COURSE_COLUMNS),
+    "testimonials": ("public.testimonials", TESTIMONIAL_COLUMNS),
+    "jobs": ("public.jobs", JOB_COLUMNS)
+}
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def export_default(value):
+    """JSON fallback for export columns: the API conversions, else str()"""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                query = """
-                    SELECT id, title, company_name, location, employment_type,
-                           is_remote, is_published, is_active, created_at
-                    FROM public.jobs 
-                    ORDER BY created_at DESC 
-                    LIMIT %s
-                """
-                cur.execute(query, (limit,))
-                results = cur.fetchall()
-                
-                return {
-                    "jobs": [dict(row) for row in results],
-                    "count": len(results)
-                }
-                
+        return json_default(value)
+    except TypeError:
+        return str(value)
+
+def csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=export_default)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+def encode_export_rows(rows, columns, fmt: str, header: bool = False) -> str:
+    if fmt == "ndjson":
+        return "".join(orjson.dumps(dict(row), default=export_default).decode() + "\n" for row in rows)
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows([csv_value(row[column]) for column in columns] for row in rows)
+    return buffer.getvalue()
+
+class ExportCursor:
+    """Named cursor whose fetches and close are serialized
+    
+    A client can go away while a fetchmany() is still running on a worker
+    thread (cancelling the await does not stop the thread). close() waits
+    for that fetch under the lock, and the connection goes back to the pool
+    only after the cursor is closed; fetches after close return no rows.
+    """
+    
+    def __init__(self, conn, cur):
+        self.conn = conn
+        self.cur = cur
+        self.closed = False
+        self._lock = threading.Lock()
+    
+    def fetch(self, size: int):
+        with self._lock:
+            if self.closed:
+                return []
+            return self.cur.fetchmany(size)
+    
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self.cur.close()
+            except Exception:
+                pass
+            # release() rolls back the read-only transaction holding the cursor
+            db_pool.release(self.conn)
+
+async def export_table(kind: str, fmt: str, since: Optional[str]):
+    """Stream a whole table as NDJSON or CSV from a server-side cursor
+    
+    The query runs under a named cursor, so PostgreSQL keeps the result
+    set and each round trip fetches DB_EXPORT_BATCH_SIZE rows; memory stays
+    flat regardless of table size. `since` limits the export to rows with
+    updated_at at or after the given ISO timestamp (inclusive, so rows
+    sharing the boundary timestamp are not missed between incremental runs).
+    The pooled connection is held until the stream ends or the client goes away.
+    """
+    table, columns = EXPORT_TABLES[kind]
+    params = []
+    sql = f"SELECT {', '.join(columns)} FROM {table}"
+    if since:
+        try:
+            params.append(datetime.fromisoformat(since.replace("Z", "+00:00")))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="since must be an ISO 8601 timestamp")
+        sql += " WHERE updated_at >= %s"
+    sql += " ORDER BY updated_at, id"
+    
+    def open_cursor():
+        conn = db_pool.acquire()
+        try:
+            cur = conn.cursor(name=f"export_{kind}_{uuid.uuid4().hex[:8]}", cursor_factory=RealDictCursor)
+            cur.execute(sql, params)
+        except Exception:
+            db_pool.release(conn)
+            raise
+        return ExportCursor(conn, cur)
+    
+    try:
+        export = await db_executor.run(open_cursor)
+    except TimeoutError as e:
+        logger.error(f"Database pool exhausted: {str(e)}")
+        raise HTTPException(status_code=503, detail=f"Database connection unavailable: {str(e)}")
     except Exception as e:
-        logger.error(f"Failed to fetch jobs: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to fetch jobs: {str(e)}")
+        logger.error(f"Failed to export {kind}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to export {kind}: {str(e)}")
+    
+    async def stream():
+        exported = 0
+        try:
+            if fmt == "csv":
+                yield encode_export_rows([], columns, fmt, header=True)
+            while True:
+                rows = await db_executor.run(export.fetch, DB_EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                exported += len(rows)
+                yield encode_export_rows(rows, columns, fmt)
+            logger.info(f"Exported {exported} rows from {table}")
+        finally:
+            db_executor.submit(export.close)
+    
+    filename = f"{kind}-{datetime.now().strftime('%Y%m%d%H%M%S')}.{fmt}"
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/api/admin/blog/export")
+async def export_blog_posts(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[str] = Query(None, description="Only rows with updated_at >= this ISO timestamp")
+):
+    """Stream all blog posts as NDJSON or CSV"""
+    return await export_table("blog", format, since)
+
+@app.get("/api/admin/courses/export")
+async def export_courses(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[str] = Query(None, description="Only rows with updated_at >= this ISO timestamp")
+):
+    """Stream all courses as NDJSON or CSV"""
+    return await export_table("courses", format, since)
+
+@app.get("/api/admin/testimonials/export")
+async def export_testimonials(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[str] = Query(None, description="Only rows with updated_at >= this ISO timestamp")
+):
+    """Stream all testimonials as NDJSON or CSV"""
+    return await export_table("testimonials", format, since)
+
+@app.get("/api/admin/jobs/export")
+async def export_jobs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[str] = Query(None, description="Only rows with updated_at >= this ISO timestamp")
+):
+    """Stream all job listings as NDJSON or CSV"""
+    return await export_table("jobs", format, since)
 
 # ========================================
 # HEALTH CHECK ENDPOINTS
@@ -916,10 +1559,28 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "version": "2.0", "mode": "direct-sql"}
 
+@app.get("/health/db-pool")
+async def database_pool_stats():
+    """Connection pool and query executor statistics"""
+    return {
+        "pool": db_pool.stats(),
+        "executor": db_executor.stats(),
+        "timestamp": datetime.now()
+    }
+
+@app.get("/health/statements")
+async def statement_stats():
+    """Per-statement execution counts and timings"""
+    return {
+        "prepared_statements": statements.enabled,
+        "statements": statements.stats(),
+        "timestamp": datetime.now()
+    }
+
 @app.get("/test-db")
 async def test_database():
     """Test database connection"""
-    try:
+    def fetch():
         with get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Test basic query
@@ -939,7 +1600,11 @@ async def test_database():
                     "tables_found": [table['table_name'] for table in tables],
                     "message": "Direct SQL database connection working"
                 }
-                
+    
+    try:
+        return await db_executor.run(fetch)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Database test failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Database test failed: {str(e)}")
@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+"""
+AI Boss Admin - Performance Benchmarks
+Runs the optimized agent against a local fake PostgREST server so results
+do not depend on Supabase latency or data.
+
+Usage:
+  python3 benchmark_ai_boss_admin.py client --requests 200 --latency-ms 50
+  python3 benchmark_ai_boss_admin.py pagination --rows 100000
+  python3 benchmark_ai_boss_admin.py fanout --clients 5000 --messages 20
+  python3 benchmark_ai_boss_admin.py dashboard --requests 200
+  python3 benchmark_ai_boss_admin.py compression --requests 200
+  python3 benchmark_ai_boss_admin.py serialization --requests 2000
+  python3 benchmark_ai_boss_admin.py search --rows 100000
+  python3 benchmark_ai_boss_admin.py replica --requests 200 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sqlite3
+import statistics
+import threading
+import time
+from datetime import datetime
+
+import httpx
+import requests
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse
+from starlette.routing import Route
+
+import http_common
+import optimized_ai_boss_admin as service
+
+BENCH_HOST = "127.0.0.1"
+BENCH_PORT = 8765
+
+def log_message(message, level="INFO"):
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] {level}: {message}")
+
+# ================================
+# FAKE POSTGREST SERVER
+# ================================
+
+class FakePostgREST:
+    """Minimal in-memory PostgREST stand-in with a fixed per-request latency"""
+    def __init__(self, latency_ms: float = 50, rows: int = 100):
+        self.latency = latency_ms / 1000
+        self.courses = [
+            {
+                "id": f"00000000-0000-0000-0000-{i:012d}",
+                "title": f"Benchmark Course {i}",
+                "description": "Benchmark course description " * 10,
+                "subject": "Mathematics",
+                "price": 999,
+                "is_published": i % 2 == 0,
+                "is_featured": i % 5 == 0,
+                "created_at": f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}",
+                "updated_at": f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}"
+            }
+            for i in range(rows)
+        ]
+        self.request_count = 0
+        self.app = Starlette(routes=[
+            Route("/rest/v1/courses", self.courses_endpoint, methods=["GET", "POST", "PATCH", "DELETE"])
+        ])
+
+    async def courses_endpoint(self, request: Request):
+        self.request_count += 1
+        await asyncio.sleep(self.latency)
+        if request.method == "GET":
+            limit = int(request.query_params.get("limit", 50))
+            return JSONResponse(self.courses[:limit])
+        if request.method == "POST":
+            return JSONResponse([await request.json()], status_code=201)
+        return JSONResponse([], status_code=200)
+
+class SQLitePostgREST:
+    """PostgREST stand-in backed by an indexed SQLite table
+    
+    Translates limit/offset/order and the keyset filter emitted by
+    get_courses into SQL, so OFFSET really scans and discards rows.
+    """
+    KEYSET = re.compile(
+        r'or\(created_at\.(lt|gt)\."([^"]+)",id\.(?:lt|gt)\."([^"]+)"\)'
+    )
+
+    def __init__(self, rows: int = 100000):
+        self.db = sqlite3.connect(":memory:", check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(
+            "CREATE TABLE courses (id TEXT PRIMARY KEY, title TEXT, description TEXT, "
+            "subject TEXT, price REAL, is_published INTEGER, created_at TEXT, updated_at TEXT)"
+        )
+        self.db.execute("CREATE INDEX idx_courses_created_at_id ON courses (created_at DESC, id DESC)")
+        self.db.executemany(
+            "INSERT INTO courses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (f"{i:08d}-0000-0000-0000-000000000000", f"Course {i}", "Description " * 20,
+                 "Mathematics", 999, 1, f"2024-01-01T00:00:00.{i:06d}", f"2024-01-01T00:00:00.{i:06d}")
+                for i in range(rows)
+            )
+        )
+        self.db.commit()
+        self.app = Starlette(routes=[Route("/rest/v1/courses", self.courses_endpoint)])
+
+    async def courses_endpoint(self, request: Request):
+        params = request.query_params
+        where, args = "", []
+        keyset = self.KEYSET.search(params.get("and", ""))
+        if keyset:
+            op, created_at, course_id = keyset.groups()
+            sql_op = "<" if op == "lt" else ">"
+            # Mirrors created_at=lte.X&and=(or(created_at.lt.X,id.lt.Y))
+            where = f"WHERE created_at {sql_op}= ? AND (created_at {sql_op} ? OR id {sql_op} ?)"
+            args = [created_at, created_at, course_id]
+        direction = "ASC" if params.get("order", "").endswith(".asc") else "DESC"
+        sql = (
+            f"SELECT * FROM courses {where} ORDER BY created_at {direction}, id {direction} "
+            f"LIMIT ? OFFSET ?"
+        )
+        args += [int(params.get("limit", 50)), int(params.get("offset", 0))]
+        rows = [dict(row) for row in self.db.execute(sql, args)]
+        return JSONResponse(rows)
+
+    def row_at(self, position: int) -> dict:
+        row = self.db.execute(
+            "SELECT * FROM courses ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?", (position,)
+        ).fetchone()
+        return dict(row)
+
+class SQLiteSearchPostgREST:
+    """PostgREST stand-in for course search over varied course text
+    
+    The ILIKE filter runs as a LIKE '%term%' scan over title and
+    description (what Postgres does without an index); the search_courses
+    RPC is served from an FTS5 index ranked by bm25, standing in for the
+    GIN-indexed tsvector in COURSE_SEARCH_MIGRATION.sql.
+    """
+    ILIKE = re.compile(r'^\(title\.ilike\."\*(.*)\*",description\.ilike\.')
+    SUBJECTS = ["Mathematics", "Physics", "Chemistry", "Biology", "Computer Science", "English"]
+    WORDS = ("algebra calculus geometry trigonometry vectors matrices probability statistics "
+             "mechanics optics thermodynamics electricity magnetism waves organic inorganic "
+             "reactions genetics ecology cells programming algorithms databases networks "
+             "grammar literature poetry essays practice revision exam board syllabus chapter "
+             "notes lessons problems solutions concepts theory applications students teacher").split()
+
+    def __init__(self, rows: int):
+        rng = random.Random(rows)
+        self.db = sqlite3.connect(":memory:", check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(
+            "CREATE TABLE courses (rowid INTEGER PRIMARY KEY, id TEXT UNIQUE, title TEXT, description TEXT, "
+            "subject TEXT, created_at TEXT)"
+        )
+        self.db.execute("CREATE INDEX idx_courses_created_at ON courses (created_at DESC)")
+        self.db.executemany(
+            "INSERT INTO courses VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (i, f"{i:08d}-0000-0000-0000-000000000000",
+                 f"{rng.choice(self.WORDS).title()} {rng.choice(self.WORDS).title()} {i}",
+                 self.description(rng),
+                 rng.choice(self.SUBJECTS), f"2024-01-01T00:00:00.{i:06d}")
+                for i in range(rows)
+            )
+        )
+        self.db.execute(
+            "CREATE VIRTUAL TABLE courses_fts USING fts5(title, subject, description, "
+            "content='courses', content_rowid='rowid')"
+        )
+        self.db.execute("INSERT INTO courses_fts(courses_fts) VALUES ('rebuild')")
+        self.db.commit()
+        self.app = Starlette(routes=[
+            Route("/rest/v1/courses", self.ilike_endpoint),
+            Route("/rest/v1/rpc/search_courses", self.rpc_endpoint)
+        ])
+
+    def description(self, rng) -> str:
+        # A few topic words in ~120 words of generic text, so a term
+        # matches a realistic slice of the catalog rather than every row
+        words = [f"w{rng.randrange(5000)}" for _ in range(117)] + rng.sample(self.WORDS, 3)
+        rng.shuffle(words)
+        return " ".join(words)
+
+    async def ilike_endpoint(self, request: Request):
+        params = request.query_params
+        term = self.ILIKE.match(params["or"]).group(1)
+        rows = self.db.execute(
+            "SELECT id, title, description, subject, created_at FROM courses "
+            "WHERE title LIKE ? OR description LIKE ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (f"%{term}%", f"%{term}%", int(params.get("limit", 50)), int(params.get("offset", 0)))
+        ).fetchall()
+        return JSONResponse([dict(row) for row in rows])
+
+    async def rpc_endpoint(self, request: Request):
+        params = request.query_params
+        query = " ".join(f'"{word}"' for word in params["q"].split())
+        rows = self.db.execute(
+            "SELECT c.id, c.title, c.description, c.subject, c.created_at FROM courses_fts "
+            "JOIN courses c ON c.rowid = courses_fts.rowid WHERE courses_fts MATCH ? "
+            "ORDER BY bm25(courses_fts, 10.0, 5.0, 1.0), c.created_at DESC LIMIT ? OFFSET ?",
+            (query, int(params.get("result_limit", 50)), int(params.get("result_offset", 0)))
+        ).fetchall()
+        return JSONResponse([dict(row) for row in rows])
+
+class BackgroundServer:
+    """Run a Starlette app with uvicorn in a daemon thread"""
+    def __init__(self, app, host: str = BENCH_HOST, port: int = BENCH_PORT):
+        self.url = f"http://{host}:{port}"
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+def report(label: str, total_requests: int, elapsed: float, latencies=None):
+    throughput = total_requests / elapsed if elapsed else 0
+    line = f"{label:<28} {total_requests:>6} req in {elapsed:7.3f}s  -> {throughput:9.1f} req/s"
+    if latencies:
+        latencies = sorted(latencies)
+        p50 = statistics.median(latencies) * 1000
+        p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+        line += f"  p50={p50:.1f}ms p95={p95:.1f}ms"
+    print(line)
+
+# ================================
+# BENCHMARKS
+# ================================
+
+def bench_client(args):
+    """Concurrent get_courses throughput: blocking requests vs pooled async client"""
+    fake = FakePostgREST(latency_ms=args.latency_ms)
+
+    with BackgroundServer(fake.app) as server:
+        async def legacy_get_courses():
+            # The pre-pool code path: a blocking requests call inside async def
+            response = requests.get(f"{server.url}/rest/v1/courses?limit=50", timeout=30)
+            return response.json()
+
+        async def run_legacy():
+            start = time.perf_counter()
+            await asyncio.gather(*(legacy_get_courses() for _ in range(args.requests)))
+            return time.perf_counter() - start
+
+        async def run_pooled():
+            agent = service.OptimizedAIBossAdmin(http_client=service.SupabaseClient(server.url))
+            await agent.http.start()
+            try:
+                await agent.get_courses({"limit": 1})  # warm the pool
+                latencies = []
+
+                async def timed():
+                    t0 = time.perf_counter()
+                    result = await agent.get_courses({"limit": 50})
+                    latencies.append(time.perf_counter() - t0)
+                    assert result["success"], result
+
+                start = time.perf_counter()
+                await asyncio.gather(*(timed() for _ in range(args.requests)))
+                return time.perf_counter() - start, latencies
+            finally:
+                await agent.http.close()
+
+        log_message(f"{args.requests} concurrent get_courses calls, {args.latency_ms}ms upstream latency")
+        legacy_elapsed = asyncio.run(run_legacy())
+        pooled_elapsed, latencies = asyncio.run(run_pooled())
+
+    report("before: blocking requests", args.requests, legacy_elapsed)
+    report("after: pooled httpx client", args.requests, pooled_elapsed, latencies)
+    print(f"speedup: {legacy_elapsed / pooled_elapsed:.1f}x")
+
+def bench_pagination(args):
+    """Page latency at deep positions: offset vs keyset cursor pagination"""
+    log_message(f"Seeding {args.rows} course rows into SQLite...")
+    fake = SQLitePostgREST(rows=args.rows)
+    positions = [p for p in (0, 1000, 10000, 50000, args.rows - 100) if 0 <= p < args.rows]
+    page_size, samples = 50, 20
+
+    with BackgroundServer(fake.app) as server:
+        async def run():
+            agent = service.OptimizedAIBossAdmin(http_client=service.SupabaseClient(server.url))
+            agent.course_cache.ttl = 0
+            await agent.http.start()
+            results = []
+            try:
+                for position in positions:
+                    cursor = service.encode_course_cursor(fake.row_at(position - 1)) if position else None
+                    timings = {}
+                    for mode in ("offset", "cursor"):
+                        filters = {"limit": page_size}
+                        if mode == "offset":
+                            filters["offset"] = position
+                        else:
+                            filters["pagination"] = "cursor"
+                            if cursor:
+                                filters["cursor"] = cursor
+                        latencies = []
+                        for _ in range(samples):
+                            t0 = time.perf_counter()
+                            result = await agent.get_courses(filters)
+                            latencies.append(time.perf_counter() - t0)
+                            assert result["success"] and result["count"] == page_size, result
+                        timings[mode] = statistics.median(latencies) * 1000
+                    results.append((position, timings["offset"], timings["cursor"]))
+            finally:
+                await agent.http.close()
+            return results
+
+        results = asyncio.run(run())
+
+    print(f"{'position':>10} {'offset p50 (ms)':>16} {'cursor p50 (ms)':>16}")
+    for position, offset_ms, cursor_ms in results:
+        print(f"{position:>10} {offset_ms:>16.2f} {cursor_ms:>16.2f}")
+
+class SimulatedWebSocket:
+    """Counts received frames; a slow client takes `delay` seconds per send"""
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        else:
+            await asyncio.sleep(0)
+        self.received += 1
+
+    async def close(self, code: int = 1000):
+        pass
+
+def bench_fanout(args):
+    """Broadcast to N clients: sequential per-client send vs queued fan-out"""
+    slow_every, slow_delay = 500, 0.02
+    service.logger.disable("optimized_ai_boss_admin")  # one line per connect otherwise
+    message = {
+        "type": "course_updated",
+        "course": {**FakePostgREST(rows=1).courses[0]},
+        "timestamp": datetime.now().isoformat()
+    }
+    log_message(f"{args.messages} broadcasts to {args.clients} clients "
+                f"(1 in {slow_every} takes {slow_delay * 1000:.0f}ms per send)")
+
+    def make_clients():
+        return [SimulatedWebSocket(slow_delay if i % slow_every == 0 else 0.0) for i in range(args.clients)]
+
+    async def legacy_broadcast(clients):
+        # The pre-fan-out ConnectionManager.broadcast loop
+        for connection in clients:
+            await connection.send_text(json.dumps(message))
+
+    async def run(broadcast, clients, drain):
+        call_times = []
+        start = time.perf_counter()
+        for _ in range(args.messages):
+            t0 = time.perf_counter()
+            await broadcast(clients)
+            call_times.append(time.perf_counter() - t0)
+        await drain(clients)
+        return time.perf_counter() - start, call_times
+
+    async def run_legacy():
+        async def drain(clients):
+            pass
+        return await run(legacy_broadcast, make_clients(), drain)
+
+    async def run_fanout():
+        manager = service.ConnectionManager(queue_size=max(args.messages, 1))
+        clients = make_clients()
+        for ws in clients:
+            await manager.connect(ws)
+
+        async def broadcast(_):
+            await manager.broadcast(message)
+
+        async def drain(clients):
+            while any(ws.received < args.messages for ws in clients):
+                await asyncio.sleep(0.001)
+
+        try:
+            return await run(broadcast, clients, drain)
+        finally:
+            await manager.shutdown()
+
+    results = {
+        "before: sequential send loop": asyncio.run(run_legacy()),
+        "after: queued fan-out": asyncio.run(run_fanout())
+    }
+
+    frames = args.messages * args.clients
+    for label, (elapsed, call_times) in results.items():
+        report(label, frames, elapsed)
+        print(f"{'':<28} broadcast() call p50={statistics.median(call_times) * 1000:.1f}ms "
+              f"max={max(call_times) * 1000:.1f}ms")
+
+def bench_dashboard(args):
+    """Dashboard page load: inline uncompressed HTML vs precompressed cached assets"""
+    service.logger.disable("optimized_ai_boss_admin")
+    assets = service.DashboardAssets()
+    assets.build()
+    page = assets.get("dashboard/index.html")["variants"][None][0].decode("utf-8")
+    local_assets = re.findall(r'(?:src|href)="(/assets/[^"]+)"', page)
+    # The pre-split page: every stylesheet and script inlined, sent uncompressed
+    legacy_page = page + "".join(
+        assets.get(url.split("?")[0][len("/assets/"):])["variants"][None][0].decode("utf-8")
+        for url in local_assets
+    )
+
+    async def legacy(request):
+        return HTMLResponse(legacy_page)
+
+    async def dashboard(request):
+        return assets.response(request, "dashboard/index.html", cache_control="no-cache")
+
+    async def asset(request):
+        return assets.response(request, request.path_params["path"], cache_control="public, max-age=31536000, immutable")
+
+    app = Starlette(routes=[
+        Route("/legacy", legacy),
+        Route("/", dashboard),
+        Route("/assets/{path:path}", asset)
+    ])
+    headers = {"Accept-Encoding": "br, gzip"}
+
+    def visit(client, repeat):
+        # One page load; a repeat visit revalidates the page and reuses cached assets
+        if repeat is None:
+            response = client.get("/legacy", headers=headers)
+            return response.num_bytes_downloaded
+        page_headers = {**headers, "If-None-Match": repeat} if repeat else headers
+        response = client.get("/", headers=page_headers)
+        downloaded = response.num_bytes_downloaded
+        if not repeat:
+            for url in local_assets:
+                downloaded += client.get(url, headers=headers).num_bytes_downloaded
+        return downloaded, response.headers["etag"]
+
+    with BackgroundServer(app) as server, httpx.Client(base_url=server.url) as client:
+        log_message(f"{args.requests} dashboard page loads ({len(local_assets)} local assets, "
+                    f"brotli {'available' if service.brotli else 'not installed'})")
+        _, etag = visit(client, False)
+        results = {}
+        for label, repeat in (("before: inline, uncompressed", None),
+                              ("after: first visit", False),
+                              ("after: repeat visit (304)", etag)):
+            latencies, downloaded = [], 0
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                t0 = time.perf_counter()
+                result = visit(client, repeat)
+                latencies.append(time.perf_counter() - t0)
+                downloaded = result if repeat is None else result[0]
+            results[label] = (time.perf_counter() - start, latencies, downloaded)
+
+    for label, (elapsed, latencies, downloaded) in results.items():
+        report(label, args.requests, elapsed, latencies)
+        print(f"{'':<28} {downloaded} body bytes per page load")
+
+def bench_compression(args):
+    """CPU time vs bytes saved for a 100-course /api/courses payload per level"""
+    words = ("algebra calculus geometry physics chemistry lesson module practice exam "
+             "students board syllabus chapter notes revision teacher video quiz").split()
+    rng = random.Random(42)
+    courses = FakePostgREST(rows=100).courses
+    for course in courses:
+        course["description"] = " ".join(rng.choice(words) for _ in range(80))
+    body = json.dumps({"success": True, "courses": courses, "count": len(courses)}).encode()
+
+    settings = [("identity", None)]
+    settings += [(f"gzip level {level}", ("gzip", level)) for level in (1, 6, 9)]
+    if http_common.brotli:
+        settings += [(f"br quality {quality}", ("br", quality)) for quality in (1, 4, 6, 11)]
+
+    log_message(f"Compressing a {len(body)} byte payload ({len(courses)} courses), {args.requests} runs each")
+    print(f"{'setting':<18} {'bytes':>8} {'saved':>7} {'p50 cpu':>10} {'MB/s':>8}")
+    for label, setting in settings:
+        timings = []
+        for _ in range(args.requests):
+            t0 = time.perf_counter()
+            if setting:
+                encoding, level = setting
+                compressor = http_common.CompressionMiddleware(None, gzip_level=level, brotli_quality=level)._compressor(encoding)
+                data = compressor.compress(body) + compressor.flush()
+            else:
+                data = body
+            timings.append(time.perf_counter() - t0)
+        p50 = statistics.median(timings)
+        throughput = f"{len(body) / p50 / 1e6:8.1f}" if setting else f"{'-':>8}"
+        print(f"{label:<18} {len(data):>8} {1 - len(data) / len(body):>6.1%} {p50 * 1000:>8.3f}ms {throughput}")
+    print(f"defaults: gzip level {http_common.COMPRESSION_GZIP_LEVEL}, br quality {http_common.COMPRESSION_BROTLI_QUALITY}, "
+          f"threshold {http_common.COMPRESSION_MIN_SIZE} bytes")
+
+def bench_serialization(args):
+    """100-course payload: jsonable_encoder + json.dumps vs orjson"""
+    import uuid
+    from decimal import Decimal
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    api_payload = {"success": True, "courses": FakePostgREST(rows=100).courses, "count": 100}
+    # Direct-SQL rows carry native column types
+    row_payload = {
+        "courses": [
+            {**course, "id": uuid.UUID(course["id"]), "price": Decimal("999.00"),
+             "created_at": datetime.fromisoformat(course["created_at"]),
+             "updated_at": datetime.fromisoformat(course["updated_at"])}
+            for course in api_payload["courses"]
+        ],
+        "count": 100
+    }
+    frame = {"type": "courses_updated", "courses": api_payload["courses"], "seq": 1, "epoch": "e"}
+
+    cases = [
+        ("API response (str values)",
+         lambda: JSONResponse(content=api_payload).body,
+         lambda: service.FastJSONResponse(content=api_payload).body),
+        ("direct-SQL rows (native)",
+         lambda: JSONResponse(content=jsonable_encoder(row_payload)).body,
+         lambda: service.FastJSONResponse(content=row_payload).body),
+        ("WebSocket frame",
+         lambda: json.dumps(frame),
+         lambda: service.dumps_json(frame).decode())
+    ]
+
+    log_message(f"Serializing 100-course payloads, {args.requests} runs each")
+    for label, before, after in cases:
+        assert json.loads(before()) == json.loads(after())
+        timings = []
+        for serialize in (before, after):
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                serialize()
+            timings.append((time.perf_counter() - start) / args.requests)
+        print(f"{label:<28} stdlib {timings[0] * 1e6:8.1f}us  orjson {timings[1] * 1e6:8.1f}us  "
+              f"-> {timings[0] / timings[1]:.1f}x")
+
+def bench_search(args):
+    """Course search latency: double-ILIKE scan vs indexed, ranked search RPC"""
+    terms = ["calculus", "organic reactions", "Trigonometry Vectors", "zzz-no-match"]
+    samples = 10
+
+    async def run(url):
+        timings = {}
+        for mode in ("ilike", "rpc"):
+            agent = service.OptimizedAIBossAdmin(http_client=service.SupabaseClient(url))
+            agent.course_cache.ttl = 0
+            agent.search_mode = mode
+            await agent.http.start()
+            try:
+                for term in terms:
+                    latencies = []
+                    for _ in range(samples):
+                        t0 = time.perf_counter()
+                        result = await agent.get_courses({"search": term, "limit": 20})
+                        latencies.append(time.perf_counter() - t0)
+                        assert result["success"] and agent.effective_search_mode() == mode, result
+                    timings[(mode, term)] = statistics.median(latencies) * 1000
+            finally:
+                await agent.http.close()
+        return timings
+
+    for rows in sorted({10000, args.rows}):
+        log_message(f"Seeding {rows} course rows into SQLite (FTS5 index for the RPC)...")
+        fake = SQLiteSearchPostgREST(rows=rows)
+        with BackgroundServer(fake.app) as server:
+            timings = asyncio.run(run(server.url))
+        print(f"{'rows':>8} {'term':<20} {'ILIKE p50 (ms)':>15} {'RPC p50 (ms)':>13}")
+        for term in terms:
+            print(f"{rows:>8} {term:<20} {timings[('ilike', term)]:>15.2f} {timings[('rpc', term)]:>13.2f}")
+
+def bench_replica(args):
+    """get_courses latency: Supabase round trip vs the local SQLite replica"""
+    fake = FakePostgREST(latency_ms=args.latency_ms, rows=1000)
+    queries = [
+        {"limit": 50},
+        {"subject": "Mathematics", "published": True, "limit": 20},
+        {"featured": True, "limit": 10, "offset": 5},
+        {"limit": 20, "pagination": "cursor"},
+    ]
+
+    with BackgroundServer(fake.app) as server:
+        async def run(replicated: bool):
+            agent = service.OptimizedAIBossAdmin(http_client=service.SupabaseClient(server.url))
+            agent.course_cache.ttl = 0
+            agent.course_replica = service.CourseReplica(
+                agent.http, agent.get_headers, enabled=replicated, page_size=len(fake.courses) + 1
+            )
+            await agent.http.start()
+            try:
+                if replicated:
+                    agent.course_replica.open()
+                    await agent.course_replica.sync(full=True)
+                latencies = []
+                start = time.perf_counter()
+                for i in range(args.requests):
+                    t0 = time.perf_counter()
+                    result = await agent.get_courses(dict(queries[i % len(queries)]))
+                    latencies.append(time.perf_counter() - t0)
+                    assert result["success"] and (result.get("source") == "replica") == replicated, result
+                return time.perf_counter() - start, latencies
+            finally:
+                await agent.course_replica.stop()
+                await agent.http.close()
+
+        log_message(f"{args.requests} sequential get_courses calls, {args.latency_ms}ms upstream latency")
+        upstream_elapsed, upstream_latencies = asyncio.run(run(False))
+        replica_elapsed, replica_latencies = asyncio.run(run(True))
+
+    report("before: Supabase round trip", args.requests, upstream_elapsed, upstream_latencies)
+    report("after: SQLite replica", args.requests, replica_elapsed, replica_latencies)
+    print(f"replica p50: {statistics.median(replica_latencies) * 1000:.3f}ms")
+
+BENCHMARKS = {
+    "client": bench_client,
+    "compression": bench_compression,
+    "dashboard": bench_dashboard,
+    "fanout": bench_fanout,
+    "pagination": bench_pagination,
+    "replica": bench_replica,
+    "search": bench_search,
+    "serialization": bench_serialization,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Boss Admin performance benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--requests", type=int, default=200, help="number of requests to issue")
+    parser.add_argument("--latency-ms", type=float, default=50, help="simulated Supabase latency")
+    parser.add_argument("--rows", type=int, default=100000, help="rows in the seeded course table")
+    parser.add_argument("--clients", type=int, default=5000, help="simulated WebSocket clients")
+    parser.add_argument("--messages", type=int, default=20, help="broadcasts to send")
+    args = parser.parse_args()
+
+    print()
+    print("="*60)
+    print(f"⏱️  AI BOSS ADMIN BENCHMARK: {args.benchmark}")
+    print("="*60)
+    BENCHMARKS[args.benchmark](args)
+
+if __name__ == "__main__":
+    main()
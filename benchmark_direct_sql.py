@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+AI Boss Admin Direct SQL - Load Tests and Benchmarks
+Drives the direct-SQL handlers in-process. By default queries run against
+simulated psycopg2 connections with a fixed per-query latency; pass --dsn
+to run against a real PostgreSQL database that has the content tables.
+
+Usage:
+  python3 benchmark_direct_sql.py concurrency --requests 50 --latency-ms 100
+  python3 benchmark_direct_sql.py concurrency --dsn postgresql://localhost/aiboss
+  python3 benchmark_direct_sql.py bulk --rows 1000 --latency-ms 2
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+import psycopg2
+
+import ai_boss_admin_direct_sql as service
+
+def log_message(message, level="INFO"):
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] {level}: {message}")
+
+# ================================
+# SIMULATED DATABASE
+# ================================
+
+class SimulatedCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.connection = conn
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        # Latency models query execution; PREPARE only parses and plans
+        if not query.startswith("PREPARE"):
+            time.sleep(self.conn.latency)
+        self.rowcount = len(self.conn.rows)
+
+    def executemany(self, query, params_seq):
+        for params in params_seq:
+            self.execute(query, params)
+
+    def fetchall(self):
+        return list(self.conn.rows)
+
+    def fetchone(self):
+        return self.conn.rows[0] if self.conn.rows else None
+
+    def fetchmany(self, size=1):
+        return list(self.conn.rows[:size])
+
+class SimulatedConnection:
+    """Stands in for a psycopg2 connection; every execute sleeps `latency`"""
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.closed = 0
+        self.rows = [
+            {"id": f"{i}", "title": f"Course {i}", "created_at": datetime(2024, 1, 1)}
+            for i in range(50)
+        ]
+
+    def cursor(self, *args, **kwargs):
+        return SimulatedCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+    def get_transaction_status(self):
+        return psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+def install_database(args, workers: int):
+    """Swap the module's pool/executor for benchmark-sized ones"""
+    if args.dsn:
+        connect = lambda: psycopg2.connect(args.dsn)
+    else:
+        connect = lambda: SimulatedConnection(args.latency_ms / 1000)
+    service.db_pool = service.DatabasePool(connect=connect, min_size=0, max_size=workers, timeout=60)
+    service.db_executor = service.DatabaseExecutor(max_workers=workers)
+    return service.db_pool, service.db_executor
+
+def report(label: str, total_requests: int, elapsed: float, latencies=None):
+    throughput = total_requests / elapsed if elapsed else 0
+    line = f"{label:<32} {total_requests:>6} req in {elapsed:7.3f}s  -> {throughput:9.1f} req/s"
+    if latencies:
+        latencies = sorted(latencies)
+        line += f"  p50={statistics.median(latencies) * 1000:.1f}ms max={latencies[-1] * 1000:.1f}ms"
+    print(line)
+
+# ================================
+# BENCHMARKS
+# ================================
+
+def bench_concurrency(args):
+    """N concurrent list_courses calls: blocking in the event loop vs executor"""
+    install_database(args, workers=args.workers)
+    log_message(f"{args.requests} concurrent list_courses calls on {args.workers} connections "
+                f"({'live database' if args.dsn else f'{args.latency_ms}ms simulated query'})")
+
+    async def blocking_list_courses():
+        # The pre-executor code path: psycopg2 calls made directly in async def
+        with service.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT id, title FROM public.courses ORDER BY created_at DESC LIMIT %s", (50,))
+                return cur.fetchall()
+
+    async def run(make_call):
+        # Completion time of each call measured from the common start
+        latencies = []
+        start = time.perf_counter()
+
+        async def timed():
+            await make_call()
+            latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(timed() for _ in range(args.requests)))
+        return time.perf_counter() - start, latencies
+
+    blocking_elapsed, blocking_latencies = asyncio.run(run(blocking_list_courses))
+    executor_elapsed, executor_latencies = asyncio.run(run(lambda: service.list_courses(limit=50)))
+    service.db_executor.shutdown()
+    service.db_pool.close()
+
+    report("before: blocking in event loop", args.requests, blocking_elapsed, blocking_latencies)
+    report("after: bounded executor", args.requests, executor_elapsed, executor_latencies)
+    if not args.dsn:
+        rounds = -(-args.requests // args.workers)
+        print(f"simulated query time: {args.latency_ms:.1f}ms; all {args.requests} finished in "
+              f"{executor_elapsed * 1000:.1f}ms (expected about {rounds} x {args.latency_ms:.1f}ms)")
+
+def bench_bulk(args):
+    """Ingest N job listings: one INSERT per row vs multi-row bulk inserts"""
+    install_database(args, workers=1)
+    service.logger.setLevel("WARNING")  # one log line per created row otherwise
+    log_message(f"Ingesting {args.rows} job listings "
+                f"({'live database' if args.dsn else f'{args.latency_ms}ms simulated round trip'})")
+    rows = [
+        {
+            "title": f"Benchmark Job {i}",
+            "company_name": "Benchmark Co",
+            "location": "Remote",
+            "description": "Benchmark job description " * 10,
+            "skills": ["python", "sql"]
+        }
+        for i in range(args.rows)
+    ]
+
+    async def single_rows():
+        for row in rows:
+            await service.create_job(service.Job(**row))
+
+    async def bulk():
+        result = await service.create_jobs_bulk(rows)
+        assert result["created"] == len(rows), result
+
+    timings = {}
+    for label, make_run in (("before: one INSERT per row", single_rows), ("after: multi-row bulk insert", bulk)):
+        start = time.perf_counter()
+        asyncio.run(make_run())
+        timings[label] = time.perf_counter() - start
+    service.db_executor.shutdown()
+    service.db_pool.close()
+
+    for label, elapsed in timings.items():
+        report(label, args.rows, elapsed)
+    before, after = timings.values()
+    print(f"page size: {service.DB_BULK_PAGE_SIZE} rows; speedup: {before / after:.1f}x")
+
+BENCHMARKS = {
+    "bulk": bench_bulk,
+    "concurrency": bench_concurrency,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Boss Admin direct-SQL benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--requests", type=int, default=50, help="number of concurrent calls")
+    parser.add_argument("--workers", type=int, default=service.DB_EXECUTOR_WORKERS,
+                        help="pool connections and executor threads (default: DB_EXECUTOR_WORKERS)")
+    parser.add_argument("--latency-ms", type=float, default=100, help="simulated per-query latency")
+    parser.add_argument("--rows", type=int, default=1000, help="rows to ingest in the bulk benchmark")
+    parser.add_argument("--dsn", help="PostgreSQL DSN to benchmark against a real database")
+    args = parser.parse_args()
+
+    print()
+    print("="*60)
+    print(f"⏱️  DIRECT SQL BENCHMARK: {args.benchmark}")
+    print("="*60)
+    BENCHMARKS[args.benchmark](args)
+
+if __name__ == "__main__":
+    main()
@@ -118,9 +118,13 @@ copy_application_files() {
     log_info "Copying application files..."
     
     # Copy the optimized admin system
-    cp optimized_ai_boss_admin.py $APP_DIR/
+    cp optimized_ai_boss_admin.py http_common.py $APP_DIR/
     cp .env.production $APP_DIR/.env
     
+    # Dashboard static assets (vendor third-party scripts first)
+    bash vendor_dashboard_assets.sh || log_warning "Vendoring failed, dashboard will load Vue from the CDN"
+    cp -r static $APP_DIR/
+    
     # Copy any additional files
     if [ -f "ai_boss_admin.py" ]; then
         cp ai_boss_admin.py $APP_DIR/
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+AI Boss Admin - Query Plan Checks
+Creates the tables from CORRECT_DATABASE_SCHEMA.sql (or --schema), seeds
+them, applies API_INDEXES_MIGRATION.sql and runs EXPLAIN ANALYZE on every
+query the two APIs issue (the PostgREST queries behind GET /api/courses
+and the direct-SQL statements). Exits non-zero when a query does not use
+the index it is expected to use; a query naming columns the schema does
+not have is reported as SKIP. The direct-SQL service's columns are those
+of CLEAN_SCHEMA_FOR_SUPABASE.sql. Needs PostgreSQL 13+ (gen_random_uuid).
+
+Everything runs in one transaction that is rolled back at the end (pass
+--keep to commit), so the tables, seed rows and indexes do not persist.
+Point it at a scratch database, not production.
+
+Usage:
+  python3 explain_api_queries.py --dsn postgresql://localhost/aiboss_plans
+  python3 explain_api_queries.py --dsn postgresql://localhost/aiboss_plans --rows 200000 --with-search
+  python3 explain_api_queries.py --dsn postgresql://localhost/aiboss_plans --schema CLEAN_SCHEMA_FOR_SUPABASE.sql
+"""
+
+import argparse
+import os
+import re
+import sys
+from datetime import datetime
+
+import psycopg2
+
+import ai_boss_admin_direct_sql as direct_sql
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_FILE = os.path.join(HERE, "CORRECT_DATABASE_SCHEMA.sql")
+INDEX_MIGRATION = os.path.join(HERE, "API_INDEXES_MIGRATION.sql")
+SEARCH_MIGRATION = os.path.join(HERE, "COURSE_SEARCH_MIGRATION.sql")
+
+def log_message(message, level="INFO"):
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] {level}: {message}")
+
+# ================================
+# SCHEMA AND SEED DATA
+# ================================
+
+# Tables seeded, parents first (course_modules/course_topics reference them)
+SEED_TABLES = ("courses", "course_modules", "course_topics", "blog_posts", "testimonials", "jobs", "instagram_posts")
+# Columns the API queries filter, order or search on; other columns keep
+# their defaults unless they are NOT NULL without one
+SEED_COLUMNS = {
+    "id", "course_id", "module_id", "created_at", "updated_at", "is_published", "is_featured",
+    "subject", "price", "title", "description", "content", "testimonial_text", "caption",
+    "module_order", "topic_order", "module_number", "order_in_module",
+}
+
+# Supabase objects the schema files reference
+SUPABASE_STUBS = """
+    CREATE SCHEMA IF NOT EXISTS auth;
+    CREATE TABLE IF NOT EXISTS auth.users (id UUID PRIMARY KEY);
+    DO $$
+    DECLARE role_name TEXT;
+    BEGIN
+        FOREACH role_name IN ARRAY ARRAY['postgres', 'anon', 'authenticated', 'service_role'] LOOP
+            IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = role_name) THEN
+                EXECUTE format('CREATE ROLE %I NOLOGIN', role_name);
+            END IF;
+        END LOOP;
+    END;
+    $$;
+"""
+
+SUBJECTS = ["Mathematics", "Physics", "Chemistry", "Biology", "Computer Science", "English"]
+WORDS = ["algebra", "calculus", "geometry", "trigonometry", "mechanics", "optics",
+         "genetics", "ecology", "programming", "databases", "grammar", "poetry"]
+
+def sql_array(values) -> str:
+    return "ARRAY[" + ", ".join(f"'{value}'" for value in values) + "]"
+
+def seed_expression(table: str, column: str, kind: str, rows: int) -> str:
+    """SQL expression for `column` (information_schema data_type `kind`) of generated row g (1..rows)"""
+    word = f"({sql_array(WORDS)})[1 + (g * 7) % {len(WORDS)}]"
+    if column == "id":
+        return f"md5('{table}' || g)::uuid"
+    if column == "course_id":
+        return f"md5('courses' || (1 + g % {rows}))::uuid"
+    if column == "module_id":
+        return f"md5('course_modules' || (1 + g % {rows}))::uuid"
+    if column == "created_at":
+        return "now() - g * interval '1 minute'"
+    if column == "updated_at":
+        # Edits land out of creation order
+        return f"now() - ((g * 7919) % {rows}) * interval '1 minute'"
+    if column == "is_published":
+        return "g % 3 = 0"
+    if column == "is_featured":
+        return "g % 50 = 0"
+    if column == "subject":
+        return f"({sql_array(SUBJECTS)})[1 + g % {len(SUBJECTS)}]"
+    if column == "price":
+        return "(g * 7919) % 100000"
+    if column == "title":
+        return f"initcap({word}) || ' ' || g"
+    if column in ("description", "content", "testimonial_text", "caption"):
+        return f"{word} || ' ' || ({sql_array(WORDS)})[1 + (g * 13) % {len(WORDS)}] || ' ' || md5(g::text)"
+    if kind == "uuid":
+        return "NULL"
+    if kind.startswith("timestamp"):
+        return "now() + g * interval '1 hour'"
+    if kind == "date":
+        return "current_date + g % 30"
+    if kind == "boolean":
+        return "g % 2 = 0"
+    if kind in ("numeric", "integer", "bigint", "smallint"):
+        return "g % 20"
+    if kind == "ARRAY":
+        return "ARRAY['python', 'sql']"
+    return f"'{column} ' || g % 100"
+
+def schema_sql(path: str) -> str:
+    """SQL of a schema file; the *_SCHEMA.sql helpers wrap it in a bash heredoc"""
+    with open(path) as f:
+        text = f.read()
+    match = re.search(r"^cat > \S+ << 'EOF'\n(.*?)^EOF$", text, re.S | re.M)
+    return match.group(1) if match else text
+
+def create_and_seed(conn, cur, schema: str, rows: int):
+    cur.execute(SUPABASE_STUBS)
+    cur.execute(schema_sql(schema))
+    del conn.notices[:]
+    log_message(f"Created tables from {os.path.basename(schema)}")
+    for table in SEED_TABLES:
+        cur.execute("""
+            SELECT column_name, data_type, is_nullable = 'NO' AND column_default IS NULL
+            FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = %s
+            ORDER BY ordinal_position
+        """, (table,))
+        columns = [(column, kind) for column, kind, required in cur.fetchall() if required or column in SEED_COLUMNS]
+        if not columns:
+            log_message(f"public.{table} is not in this schema; not seeded", "WARNING")
+            continue
+        expressions = ", ".join(seed_expression(table, column, kind, rows) for column, kind in columns)
+        cur.execute(
+            f"INSERT INTO public.{table} ({', '.join(column for column, _ in columns)}) "
+            f"SELECT {expressions} FROM generate_series(1, {int(rows)}) AS g"
+        )
+        log_message(f"Seeded {cur.rowcount} rows into public.{table}")
+
+def apply_migration(conn, cur, path: str):
+    with open(path) as f:
+        cur.execute(f.read())
+    for notice in conn.notices:
+        log_message(notice.strip(), "WARNING" if "Skipping" in notice else "INFO")
+    del conn.notices[:]
+    log_message(f"Applied {os.path.basename(path)}")
+
+# ================================
+# QUERY CHECKS
+# ================================
+
+def api_queries(cur, with_search: bool):
+    """(label, sql, params, acceptable index names) for each API query"""
+    cur.execute("SELECT created_at, id FROM public.courses ORDER BY created_at DESC, id DESC OFFSET 5000 LIMIT 1")
+    cursor_created_at, cursor_id = cur.fetchone()
+    cur.execute("SELECT course_id FROM public.course_modules LIMIT 1")
+    course_id = cur.fetchone()[0]
+    cur.execute("SELECT module_id FROM public.course_topics LIMIT 1")
+    module_id = cur.fetchone()[0]
+
+    newest = "ORDER BY created_at DESC LIMIT 50 OFFSET 0"
+    queries = [
+        # GET /api/courses as PostgREST runs it
+        ("GET /api/courses", f"SELECT * FROM public.courses {newest}", (),
+         {"idx_courses_created_at_id"}),
+        ("GET /api/courses?offset=5000",
+         "SELECT * FROM public.courses ORDER BY created_at DESC LIMIT 50 OFFSET 5000", (),
+         {"idx_courses_created_at_id"}),
+        ("GET /api/courses?pagination=cursor",
+         "SELECT * FROM public.courses WHERE created_at <= %s AND (created_at < %s OR id < %s) "
+         "ORDER BY created_at DESC, id DESC LIMIT 50",
+         (cursor_created_at, cursor_created_at, cursor_id), {"idx_courses_created_at_id"}),
+        ("GET /api/courses?subject=Physics",
+         f"SELECT * FROM public.courses WHERE subject = %s {newest}", ("Physics",),
+         {"idx_courses_subject_created_at"}),
+        ("GET /api/courses?published=true",
+         f"SELECT * FROM public.courses WHERE is_published = true {newest}", (),
+         {"idx_courses_published_created_at"}),
+        ("GET /api/courses?featured=true",
+         f"SELECT * FROM public.courses WHERE is_featured = true {newest}", (),
+         {"idx_courses_featured_created_at"}),
+        ("GET /api/courses?published=true&featured=true",
+         f"SELECT * FROM public.courses WHERE is_published = true AND is_featured = true {newest}", (),
+         {"idx_courses_featured_created_at", "idx_courses_published_created_at"}),
+        # Either plan is fine: a price range scan, or walking created_at
+        # until 50 rows match when the range is wide
+        ("get_courses(min_price, max_price)",
+         f"SELECT * FROM public.courses WHERE price >= %s AND price <= %s {newest}", (1000, 1100),
+         {"idx_courses_price", "idx_courses_created_at_id"}),
+        # Position columns differ per schema; the variant a schema lacks is skipped
+        ("course modules of a course",
+         "SELECT * FROM public.course_modules WHERE course_id = %s ORDER BY module_order", (course_id,),
+         {"idx_course_modules_course_order"}),
+        ("course modules of a course (module_number)",
+         "SELECT * FROM public.course_modules WHERE course_id = %s ORDER BY module_number", (course_id,),
+         {"idx_course_modules_course_number"}),
+        ("course topics of a module",
+         "SELECT * FROM public.course_topics WHERE module_id = %s ORDER BY topic_order", (module_id,),
+         {"idx_course_topics_module_order"}),
+        ("course topics of a module (order_in_module)",
+         "SELECT * FROM public.course_topics WHERE module_id = %s ORDER BY order_in_module", (module_id,),
+         {"idx_course_topics_module_position"}),
+    ]
+
+    # The direct-SQL statements, verbatim from the registry
+    listings = {
+        "list_courses": "idx_courses_created_at_id",
+        "list_blog_posts": "idx_blog_posts_created_at",
+        "list_testimonials": "idx_testimonials_created_at",
+        "list_jobs": "idx_jobs_created_at",
+    }
+    for name, index in listings.items():
+        queries.append((f"direct-SQL {name}", direct_sql.statements.sql(name), (50,), {index}))
+
+    for kind, (table, columns) in direct_sql.EXPORT_TABLES.items():
+        cur.execute(f"SELECT max(updated_at) - interval '1 hour' FROM {table}")
+        since = cur.fetchone()[0]
+        queries.append((
+            f"GET /api/admin/{kind}/export?since=",
+            f"SELECT {', '.join(columns)} FROM {table} WHERE updated_at >= %s ORDER BY updated_at, id",
+            (since,),
+            {f"idx_{table.split('.')[1]}_updated_at_id"}
+        ))
+
+    if with_search:
+        # The search_courses RPC body (a function call hides its plan)
+        queries.append((
+            "GET /api/courses?search=calculus",
+            "SELECT * FROM public.courses "
+            "WHERE public.course_search_document(title, subject, description) @@ websearch_to_tsquery('english', %s) "
+            "OR title ILIKE %s LIMIT 50",
+            ("calculus", "%calculus%"),
+            {"idx_courses_search_document", "idx_courses_title_trgm"}
+        ))
+    return queries
+
+def plan_nodes(plan):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+def explain(cur, sql: str, params):
+    cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params or None)
+    result = cur.fetchone()[0][0]
+    nodes = list(plan_nodes(result["Plan"]))
+    indexes = {node["Index Name"] for node in nodes if "Index Name" in node}
+    seq_scans = {node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"}
+    return indexes, seq_scans, result["Execution Time"]
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE the API's queries against a seeded database")
+    parser.add_argument("--dsn", required=True, help="PostgreSQL DSN of a scratch database")
+    parser.add_argument("--schema", default=SCHEMA_FILE, help="schema file creating the tables")
+    parser.add_argument("--rows", type=int, default=100000, help="rows seeded per table")
+    parser.add_argument("--with-search", action="store_true", help="also apply and check COURSE_SEARCH_MIGRATION.sql")
+    parser.add_argument("--keep", action="store_true", help="commit the seeded tables and indexes")
+    args = parser.parse_args()
+
+    print()
+    print("="*60)
+    print("🔍 API QUERY PLAN CHECKS")
+    print("="*60)
+
+    conn = psycopg2.connect(args.dsn)
+    failures = 0
+    try:
+        with conn.cursor() as cur:
+            create_and_seed(conn, cur, args.schema, args.rows)
+            apply_migration(conn, cur, INDEX_MIGRATION)
+            if args.with_search:
+                apply_migration(conn, cur, SEARCH_MIGRATION)
+            cur.execute("ANALYZE")
+
+            print(f"\n{'':<6} {'query':<46} {'ms':>8}  plan")
+            for label, sql, params, expected in api_queries(cur, args.with_search):
+                cur.execute("SAVEPOINT query_check")
+                try:
+                    indexes, seq_scans, elapsed = explain(cur, sql, params)
+                except psycopg2.errors.UndefinedColumn as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT query_check")
+                    print(f"{'SKIP':<6} {label:<46} {'':>8}  {str(e).splitlines()[0]}")
+                    continue
+                ok = bool(indexes & expected)
+                failures += not ok
+                used = ", ".join(sorted(indexes)) or "no index"
+                if seq_scans:
+                    used += f" (Seq Scan on {', '.join(sorted(seq_scans))})"
+                print(f"{'PASS' if ok else 'FAIL':<6} {label:<46} {elapsed:>8.2f}  {used}")
+                if not ok:
+                    print(f"{'':<6} expected one of: {', '.join(sorted(expected))}")
+        if args.keep:
+            conn.commit()
+        else:
+            conn.rollback()
+    finally:
+        conn.close()
+
+    print()
+    if failures:
+        log_message(f"{failures} queries did not use their expected index", "ERROR")
+        sys.exit(1)
+    log_message("All API queries use their expected indexes")
+
+if __name__ == "__main__":
+    main()
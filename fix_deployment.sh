@@ -44,10 +44,16 @@ fi
 
 if [[ -f "optimized_ai_boss_admin.py" ]]; then
     echo "📄 Copying main application..."
-    cp optimized_ai_boss_admin.py /opt/ai-boss-admin/
+    cp optimized_ai_boss_admin.py http_common.py /opt/ai-boss-admin/
     echo "✅ Main application copied"
 fi
 
+if [[ -d "static" ]]; then
+    echo "🎨 Copying dashboard assets..."
+    cp -r static /opt/ai-boss-admin/
+    echo "✅ Dashboard assets copied"
+fi
+
 if [[ -f "requirements.production.txt" ]]; then
     echo "📋 Copying requirements..."
     cp requirements.production.txt /opt/ai-boss-admin/
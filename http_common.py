@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+AI Boss Admin - Shared HTTP helpers
+Response plumbing used by both optimized_ai_boss_admin.py and
+ai_boss_admin_direct_sql.py; deploy this file next to either app.
+
+- gzip/brotli response compression (CompressionMiddleware)
+- orjson rendering (FastJSONResponse, FastJSONRoute)
+- conditional GET (weak ETag, Last-Modified on single items, 304 Not Modified)
+"""
+
+import os
+import asyncio
+import functools
+import hashlib
+import zlib
+from datetime import datetime, timezone
+from decimal import Decimal
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import orjson
+from fastapi import Request
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from pydantic import BaseModel
+try:
+    import brotli
+except ImportError:  # optional: responses are then gzip-only
+    brotli = None
+
+# Response compression (gzip, or brotli when installed and accepted)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "6"))
+
+# ================================
+# COMPRESSION
+# ================================
+
+def choose_encoding(accept_encoding: str, available: Iterable[str] = ("br", "gzip")) -> Optional[str]:
+    """Pick the best content coding the client accepts (br before gzip)"""
+    accepted = {}
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    for encoding in available:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with gzip or brotli
+    
+    Bodies below `minimum_size`, responses that already carry a
+    Content-Encoding and already-compressed media types pass through
+    untouched. Streaming responses (more_body) are compressed chunk by
+    chunk without being buffered.
+    """
+    SKIP_CONTENT_TYPES = (
+        "image/", "video/", "audio/", "font/woff",
+        "application/zip", "application/gzip", "application/x-gzip",
+        "application/x-brotli", "application/pdf", "application/octet-stream",
+        "text/event-stream"
+    )
+    
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE,
+                 gzip_level: int = COMPRESSION_GZIP_LEVEL, brotli_quality: int = COMPRESSION_BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        headers = dict((k.lower(), v) for k, v in scope["headers"])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None
+        compressor = None
+        passthrough = False
+        
+        async def compressing_send(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                response_headers = MutableHeaders(scope=start_message)
+                if not self._compressible(start_message["status"], response_headers, body, more_body):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                
+                compressor = self._compressor(encoding)
+                response_headers["Content-Encoding"] = encoding
+                response_headers.add_vary_header("Accept-Encoding")
+                etag = response_headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    response_headers["ETag"] = f"W/{etag}"
+                if more_body:
+                    del response_headers["Content-Length"]
+                else:
+                    body = compressor.compress(body) + compressor.flush()
+                    response_headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+            
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.flush()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+        
+        await self.app(scope, receive, compressing_send)
+    
+    def _compressible(self, status: int, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        if status < 200 or status in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        if headers.get("content-type", "").lower().startswith(self.SKIP_CONTENT_TYPES):
+            return False
+        return more_body or len(body) >= self.minimum_size
+    
+    def _compressor(self, encoding: str):
+        if encoding == "br":
+            return BrotliStream(self.brotli_quality)
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+class BrotliStream:
+    """brotli.Compressor with the zlib compressobj interface"""
+    def __init__(self, quality: int):
+        self.compressor = brotli.Compressor(quality=quality)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+    
+    def flush(self) -> bytes:
+        return self.compressor.finish()
+
+# ================================
+# JSON SERIALIZATION
+# ================================
+
+def json_default(value):
+    """orjson fallback for the types it does not serialize natively"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps_json(content) -> bytes:
+    """Serialize with orjson (datetime, date, UUID natively; Decimal via json_default)"""
+    return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+class FastJSONRoute(APIRoute):
+    """APIRoute that renders plain dict/list results with FastJSONResponse
+    
+    FastAPI otherwise runs every returned value through jsonable_encoder
+    before serializing it. Routes with a response_model or another
+    response_class keep the stock behavior.
+    """
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        response_class = kwargs.get("response_class")
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        if (isinstance(kwargs.get("response_model", Default(None)), DefaultPlaceholder)
+                and isinstance(response_class, type) and issubclass(response_class, FastJSONResponse)
+                and asyncio.iscoroutinefunction(endpoint)):
+            endpoint = self.render_plain_results(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+    
+    @staticmethod
+    def render_plain_results(endpoint: Callable) -> Callable:
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            return FastJSONResponse(content=result)
+        return wrapper
+
+# ================================
+# CONDITIONAL GET
+# ================================
+
+def etag_matches(if_none_match: Optional[str], etags: Iterable[str]) -> bool:
+    """True if an If-None-Match header matches one of `etags` (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or any(tag.removeprefix("W/") in candidates for tag in etags)
+
+def as_utc(value) -> Optional[datetime]:
+    """Parse a row timestamp (datetime or ISO string) as an aware UTC datetime"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def collection_validators(rows: List[Dict], *parts) -> Tuple[str, Optional[datetime]]:
+    """Weak ETag and Last-Modified for a list of rows
+    
+    The ETag covers the row count, each row's id and updated_at (created_at
+    when there is none) and `parts` (the query), so checking it never
+    serializes the rows. Last-Modified is the newest of those timestamps.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode())
+    last_modified = None
+    for row in rows:
+        stamp = row.get("updated_at") or row.get("created_at")
+        digest.update(f"|{row.get('id')}@{stamp}".encode())
+        stamp = as_utc(stamp)
+        if stamp is not None and (last_modified is None or stamp > last_modified):
+            last_modified = stamp
+    return f'W/"{len(rows)}-{digest.hexdigest()[:24]}"', last_modified
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, [etag])
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = as_utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+        return since is not None and last_modified.replace(microsecond=0) <= since
+    return False
+
+def conditional_response(request: Request, content: Dict, rows: List[Dict], *parts, item: bool = False) -> Response:
+    """JSON response carrying validators, or a bodiless 304 when the client's copy is current
+    
+    Last-Modified is only sent (and If-Modified-Since only honored) for a
+    single item: deleting a row from a collection leaves its newest
+    timestamp unchanged, so collections are validated by ETag alone.
+    """
+    etag, last_modified = collection_validators(rows, *parts)
+    if not item:
+        last_modified = None
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    if not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(content=content, headers=headers)
@@ -0,0 +1,258 @@
+const { createApp } = Vue;
+
+createApp({
+    data() {
+        return {
+            courses: [],
+            newCourse: {
+                title: '',
+                description: '',
+                subject: '',
+                grade_level: 'Class 11th CBSE',
+                target_audience: 'Class 11th students',
+                instructor_name: '',
+                course_duration: '',
+                price: 0,
+                is_published: false,
+                is_featured: false
+            },
+            newBlog: {
+                title: '',
+                content: ''
+            },
+            blogTags: '',
+            loading: false,
+            message: '',
+            messageType: 'success',
+            systemStatus: {},
+            activeConnections: 0
+        }
+    },
+    computed: {
+        publishedCount() {
+            return this.courses.filter(c => c.is_published).length;
+        },
+        featuredCount() {
+            return this.courses.filter(c => c.is_featured).length;
+        }
+    },
+    async mounted() {
+        await this.loadSystemStatus();
+        await this.loadCourses();
+        this.initializeWebSocket();
+    },
+    methods: {
+        getMessageClass() {
+            return `message ${this.messageType}-message`;
+        },
+        async loadSystemStatus() {
+            try {
+                const response = await fetch('/api/system/status');
+                const result = await response.json();
+                if (result.success) {
+                    this.systemStatus = result.system;
+                }
+            } catch (error) {
+                console.error('Error loading system status:', error);
+            }
+        },
+        async loadCourses() {
+            this.loading = true;
+            try {
+                const response = await fetch('/api/courses');
+                const result = await response.json();
+                if (result.success) {
+                    this.courses = result.data;
+                } else {
+                    this.showMessage(result.error, 'error');
+                }
+            } catch (error) {
+                this.showMessage('Error loading courses: ' + error.message, 'error');
+            } finally {
+                this.loading = false;
+            }
+        },
+        async createCourse() {
+            if (!this.newCourse.title.trim()) {
+                this.showMessage('Please enter a course title', 'error');
+                return;
+            }
+
+            if (!this.newCourse.subject) {
+                this.showMessage('Please select a subject', 'error');
+                return;
+            }
+
+            this.loading = true;
+            try {
+                const response = await fetch('/api/courses', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(this.newCourse)
+                });
+
+                const result = await response.json();
+                if (result.success) {
+                    this.showMessage(result.message, 'success');
+                    this.resetCourseForm();
+                    await this.loadCourses();
+                } else {
+                    if (result.action_required) {
+                        this.showMessage(result.error + ' - Click "Get RLS Policy Fix" button', 'warning');
+                    } else {
+                        this.showMessage(result.error, 'error');
+                    }
+                }
+            } catch (error) {
+                this.showMessage('Error creating course: ' + error.message, 'error');
+            } finally {
+                this.loading = false;
+            }
+        },
+        async createMathematicsCourse() {
+            this.loading = true;
+            try {
+                const response = await fetch('/api/courses/mathematics-class11', {
+                    method: 'POST'
+                });
+
+                const result = await response.json();
+                if (result.success) {
+                    this.showMessage('Mathematics Class 11 course created successfully!', 'success');
+                    await this.loadCourses();
+                } else {
+                    if (result.action_required) {
+                        this.showMessage('RLS Policy blocking course creation. Get the fix from the button above.', 'warning');
+                    } else {
+                        this.showMessage(result.error, 'error');
+                    }
+                }
+            } catch (error) {
+                this.showMessage('Error creating Mathematics course: ' + error.message, 'error');
+            } finally {
+                this.loading = false;
+            }
+        },
+        async createBlog() {
+            if (!this.newBlog.title.trim()) {
+                this.showMessage('Please enter a blog title', 'error');
+                return;
+            }
+
+            this.loading = true;
+            try {
+                const blogData = {
+                    ...this.newBlog,
+                    tags: this.blogTags.split(',').map(tag => tag.trim()).filter(tag => tag)
+                };
+
+                const response = await fetch('/api/blogs', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(blogData)
+                });
+
+                const result = await response.json();
+                if (result.success) {
+                    this.showMessage(result.message, 'success');
+                    this.resetBlogForm();
+                } else {
+                    this.showMessage(result.error, 'error');
+                }
+            } catch (error) {
+                this.showMessage('Error creating blog: ' + error.message, 'error');
+            } finally {
+                this.loading = false;
+            }
+        },
+        async checkHealth() {
+            this.loading = true;
+            try {
+                const response = await fetch('/api/health');
+                const result = await response.json();
+                this.showMessage(`Database: ${result.database}, RLS: ${result.rls_policy} (checked ${result.snapshot_age_seconds}s ago)`, 'success');
+                await this.loadSystemStatus();
+            } catch (error) {
+                this.showMessage('Health check failed: ' + error.message, 'error');
+            } finally {
+                this.loading = false;
+            }
+        },
+        async getRLSPolicyFix() {
+            this.loading = true;
+            try {
+                const response = await fetch('/api/admin/rls-fix');
+                const result = await response.json();
+                if (result.success) {
+                    this.showMessage('RLS Policy fix instructions ready. Check browser console for SQL command.', 'success');
+                    console.log('RLS Policy Fix SQL:');
+                    console.log(result.sql);
+                } else {
+                    this.showMessage(result.error, 'error');
+                }
+            } catch (error) {
+                this.showMessage('Error getting RLS fix: ' + error.message, 'error');
+            } finally {
+                this.loading = false;
+            }
+        },
+        async exportCourses() {
+            try {
+                const data = JSON.stringify(this.courses, null, 2);
+                const blob = new Blob([data], { type: 'application/json' });
+                const url = URL.createObjectURL(blob);
+                const a = document.createElement('a');
+                a.href = url;
+                a.download = `courses_export_${new Date().toISOString().split('T')[0]}.json`;
+                a.click();
+                URL.revokeObjectURL(url);
+                this.showMessage('Courses exported successfully', 'success');
+            } catch (error) {
+                this.showMessage('Export failed: ' + error.message, 'error');
+            }
+        },
+        async showSystemStatus() {
+            await this.loadSystemStatus();
+            const status = this.systemStatus;
+            this.showMessage(
+                `System: ${status.status || 'Unknown'} | Database: ${status.database || 'Unknown'} | RLS: ${status.rls_policy || 'Unknown'}`,
+                'success'
+            );
+        },
+        refreshCourses() {
+            this.loadCourses();
+        },
+        resetCourseForm() {
+            this.newCourse = {
+                title: '',
+                description: '',
+                subject: '',
+                grade_level: 'Class 11th CBSE',
+                target_audience: 'Class 11th students',
+                instructor_name: '',
+                course_duration: '',
+                price: 0,
+                is_published: false,
+                is_featured: false
+            };
+        },
+        resetBlogForm() {
+            this.newBlog = { title: '', content: '' };
+            this.blogTags = '';
+        },
+        showMessage(msg, type) {
+            this.message = msg;
+            this.messageType = type;
+            setTimeout(() => {
+                this.message = '';
+            }, 8000);
+        },
+        initializeWebSocket() {
+            // WebSocket implementation would go here
+            // For now, we'll simulate active connections
+            setInterval(() => {
+                this.activeConnections = Math.floor(Math.random() * 5) + 1;
+            }, 5000);
+        }
+    }
+}).mount('#app');
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+AI Boss Admin Direct SQL - Unit Tests
+Exercises the direct-SQL data layer with fake psycopg2 connections, so no
+PostgreSQL server is needed.
+
+Run with: python3 -m pytest test_ai_boss_admin_direct_sql.py
+"""
+
+import asyncio
+import csv
+import io
+import json
+import threading
+import time
+import uuid
+
+import pytest
+from psycopg2 import extensions
+
+import ai_boss_admin_direct_sql as service
+
+class FakeCursor:
+    def __init__(self, conn, name=None):
+        self.conn = conn
+        self.connection = conn
+        self.name = name
+        self.closed = False
+        self._remaining = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise service.psycopg2.OperationalError("server closed the connection")
+        self.conn.executed.append((query, params))
+        self.conn.status = extensions.TRANSACTION_STATUS_INTRANS
+        if self.conn.delay:
+            time.sleep(self.conn.delay)
+
+    def fetchall(self):
+        return list(self.conn.rows)
+
+    def fetchone(self):
+        return self.conn.rows[0] if self.conn.rows else None
+
+    def fetchmany(self, size=1):
+        if self._remaining is None:
+            self._remaining = list(self.conn.rows)
+        batch, self._remaining = self._remaining[:size], self._remaining[size:]
+        self.conn.fetch_sizes.append(len(batch))
+        return batch
+
+    def close(self):
+        self.closed = True
+
+class FakeConnection:
+    def __init__(self, delay=0.0, rows=()):
+        self.delay = delay
+        self.rows = list(rows)
+        self.closed = 0
+        self.broken = False
+        self.executed = []
+        self.commits = 0
+        self.cursors = []
+        self.fetch_sizes = []
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self, name=None, cursor_factory=None, **kwargs):
+        cur = FakeCursor(self, name)
+        self.cursors.append(cur)
+        return cur
+
+    def commit(self):
+        self.commits += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+    def get_transaction_status(self):
+        return self.status
+
+def make_pool(**overrides):
+    created = []
+
+    def connect():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    options = {"min_size": 1, "max_size": 2, "max_lifetime": 60, "timeout": 0.2, "check_idle_after": 60}
+    options.update(overrides)
+    return service.DatabasePool(connect=connect, **options), created
+
+# ================================
+# CONNECTION POOL
+# ================================
+
+def test_pool_reuses_connections():
+    pool, created = make_pool()
+    pool.open()
+    for _ in range(5):
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+    stats = pool.stats()
+    assert len(created) == 1
+    assert stats["borrowed"] == 5 and stats["returned"] == 5
+    assert stats["idle"] == 1 and stats["in_use"] == 0
+
+def test_pool_health_checks_idle_connections_on_borrow():
+    pool, created = make_pool(check_idle_after=0)
+    pool.open()
+    created[0].broken = True
+    with pool.connection() as conn:
+        assert conn is created[1]
+    assert pool.stats()["health_check_failures"] == 1
+    assert created[0].closed
+
+def test_pool_recycles_connections_past_max_lifetime():
+    pool, created = make_pool(max_lifetime=0.01)
+    pool.open()
+    time.sleep(0.02)
+    with pool.connection() as conn:
+        assert conn is not created[0]
+    assert pool.stats()["recycled"] >= 1
+
+def test_pool_blocks_then_times_out_when_exhausted():
+    pool, _ = make_pool(max_size=1, timeout=0.1)
+    conn = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    threading.Timer(0.05, pool.release, args=(conn,)).start()
+    pool.timeout = 1
+    assert pool.acquire() is conn
+    assert pool.stats()["timeouts"] == 1
+
+def test_pool_rolls_back_and_keeps_connection_on_query_error():
+    pool, created = make_pool()
+    with pytest.raises(ValueError):
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            raise ValueError("boom")
+    assert created[0].status == extensions.TRANSACTION_STATUS_IDLE
+    assert created[0].commits == 0
+    assert pool.stats()["idle"] == 1
+
+# ================================
+# NON-BLOCKING QUERY EXECUTION
+# ================================
+
+def test_concurrent_list_courses_run_one_round_per_pool_size(monkeypatch):
+    delay, calls = 0.05, 50
+
+    def connect():
+        return FakeConnection(delay=delay, rows=[{"id": "1", "title": "Course"}])
+
+    # Default sizes: DB_POOL_MAX_SIZE connections, DB_EXECUTOR_WORKERS threads
+    pool = service.DatabasePool(connect=connect, min_size=0)
+    executor = service.DatabaseExecutor()
+    monkeypatch.setattr(service, "db_pool", pool)
+    monkeypatch.setattr(service, "db_executor", executor)
+
+    async def scenario():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(service.list_courses(limit=10) for _ in range(calls)))
+        return time.perf_counter() - start, results
+
+    elapsed, results = asyncio.run(scenario())
+    executor.shutdown()
+    assert all(result["count"] == 1 for result in results)
+    # 50 calls take ceil(50 / pool size) query times: 5 rounds with the
+    # default 10 connections, far below the 50 rounds of running serially
+    rounds = -(-calls // min(pool.max_size, executor.max_workers))
+    assert rounds == 5
+    assert rounds * delay * 0.9 <= elapsed < rounds * delay * 3
+
+def test_executor_caps_concurrent_queries():
+    executor = service.DatabaseExecutor(max_workers=2)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    async def scenario():
+        await asyncio.gather(*(executor.run(work) for _ in range(8)))
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    assert peak == 2
+    assert executor.stats()["completed"] == 8
+
+# ================================
+# PREPARED STATEMENT REGISTRY
+# ================================
+
+def test_statements_are_prepared_once_per_connection():
+    registry = service.StatementRegistry(enabled=True)
+    registry.define("list_things", "SELECT * FROM things WHERE a = %s LIMIT %s")
+    first, second = FakeConnection(), FakeConnection()
+
+    for conn in (first, first, second):
+        with conn.cursor() as cur:
+            registry.execute(cur, "list_things", ("x", 5))
+
+    assert [q for q, _ in first.executed] == [
+        "PREPARE list_things AS SELECT * FROM things WHERE a = $1 LIMIT $2",
+        "EXECUTE list_things (%s, %s)",
+        "EXECUTE list_things (%s, %s)",
+    ]
+    assert second.executed[0][0].startswith("PREPARE list_things")
+    stats = registry.stats()["list_things"]
+    assert stats["calls"] == 3 and stats["prepares"] == 2
+
+def test_statements_fall_back_to_plain_sql_when_disabled():
+    registry = service.StatementRegistry(enabled=False)
+    registry.define("count_things", "SELECT count(*) FROM things")
+    conn = FakeConnection()
+    with conn.cursor() as cur:
+        registry.execute(cur, "count_things")
+    assert conn.executed == [("SELECT count(*) FROM things", None)]
+
+def test_list_endpoints_use_registered_statements(monkeypatch):
+    conn = FakeConnection(rows=[{"id": "1"}])
+    registry = service.StatementRegistry(enabled=True)
+    for name, statement in service.statements._statements.items():
+        registry.define(name, statement["sql"])
+    pool = service.DatabasePool(connect=lambda: conn, min_size=0, max_size=1)
+    monkeypatch.setattr(service, "db_pool", pool)
+    monkeypatch.setattr(service, "statements", registry)
+    monkeypatch.setattr(service, "db_executor", service.DatabaseExecutor(max_workers=1))
+
+    async def scenario():
+        await service.list_courses(limit=10)
+        await service.list_courses(limit=20)
+
+    asyncio.run(scenario())
+    service.db_executor.shutdown()
+    assert [q.split(" AS ")[0] for q, _ in conn.executed] == [
+        "PREPARE list_courses", "EXECUTE list_courses (%s)", "EXECUTE list_courses (%s)"
+    ]
+    assert registry.stats()["list_courses"]["calls"] == 2
+
+# ================================
+# BULK INSERTS
+# ================================
+
+def sample_job(**overrides):
+    job = {"title": "Engineer", "company_name": "Acme", "location": "Remote", "description": "Build things"}
+    job.update(overrides)
+    return job
+
+def use_connection(monkeypatch, conn):
+    pool = service.DatabasePool(connect=lambda: conn, min_size=0, max_size=1)
+    monkeypatch.setattr(service, "db_pool", pool)
+    monkeypatch.setattr(service, "db_executor", service.DatabaseExecutor(max_workers=1))
+
+def test_bulk_jobs_use_multi_row_inserts_in_one_transaction(monkeypatch):
+    conn = FakeConnection()
+    use_connection(monkeypatch, conn)
+    monkeypatch.setattr(service, "DB_BULK_PAGE_SIZE", 2)
+    rows = [sample_job(title=f"Job {i}") for i in range(5)]
+    rows.insert(1, {"title": "Missing fields"})
+
+    result = asyncio.run(service.create_jobs_bulk(rows))
+    service.db_executor.shutdown()
+
+    assert (result["total"], result["created"], result["failed"]) == (6, 5, 1)
+    assert not result["results"][1]["success"] and "company_name" in result["results"][1]["error"]
+    ids = [r["id"] for r in result["results"] if r["success"]]
+    assert len(set(ids)) == 5
+    # Pages of 2, 2 and 1 rows, committed once
+    assert [query.count("), (") + 1 for query, _ in conn.executed] == [2, 2, 1]
+    assert [len(params) for _, params in conn.executed] == [len(service.JOB_COLUMNS) * n for n in (2, 2, 1)]
+    assert [params[0] for _, params in conn.executed[:1]] == ids[:1]
+    assert conn.commits == 1
+
+def test_bulk_insert_failure_rolls_back_every_row(monkeypatch):
+    conn = FakeConnection()
+    use_connection(monkeypatch, conn)
+    monkeypatch.setattr(service, "DB_BULK_PAGE_SIZE", 1)
+    original_execute = FakeCursor.execute
+
+    def failing_execute(self, query, params=None):
+        original_execute(self, query, params)
+        if len(self.conn.executed) == 2:
+            raise service.psycopg2.IntegrityError("duplicate key")
+
+    monkeypatch.setattr(FakeCursor, "execute", failing_execute)
+    rows = [{"client_name": f"Client {i}", "testimonial_text": "Great"} for i in range(3)]
+
+    with pytest.raises(service.HTTPException) as error:
+        asyncio.run(service.create_testimonials_bulk(rows))
+    service.db_executor.shutdown()
+    assert error.value.status_code == 500
+    assert conn.commits == 0
+    assert conn.status == extensions.TRANSACTION_STATUS_IDLE
+
+# ================================
+# STREAMING EXPORTS
+# ================================
+
+def export_client(monkeypatch, conn):
+    from fastapi.testclient import TestClient
+
+    pool = service.DatabasePool(connect=lambda: conn, min_size=0, max_size=1)
+    monkeypatch.setattr(service, "db_pool", pool)
+    monkeypatch.setattr(service, "db_executor", service.DatabaseExecutor(max_workers=1))
+    monkeypatch.setattr(service, "DB_EXPORT_BATCH_SIZE", 2)
+    return TestClient(service.app), pool
+
+def test_export_streams_ndjson_from_named_cursor_in_batches(monkeypatch):
+    from datetime import datetime
+
+    rows = [
+        {"id": str(i), "title": f"Course {i}", "price": 10, "updated_at": datetime(2024, 1, i + 1)}
+        for i in range(5)
+    ]
+    conn = FakeConnection(rows=rows)
+    client, pool = export_client(monkeypatch, conn)
+
+    response = client.get("/api/admin/courses/export?since=2024-01-01T00:00:00Z")
+    service.db_executor.shutdown()
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == ["0", "1", "2", "3", "4"]
+    assert lines[0]["updated_at"] == "2024-01-01T00:00:00"
+    query, params = conn.executed[0]
+    assert "WHERE updated_at >= %s ORDER BY updated_at, id" in query
+    assert params[0].year == 2024
+    assert conn.cursors[0].name.startswith("export_courses_")
+    assert conn.fetch_sizes == [2, 2, 1, 0]
+    assert conn.cursors[0].closed
+    assert pool.stats()["in_use"] == 0
+
+def test_export_disconnect_closes_cursor_only_after_running_fetch(monkeypatch):
+    conn = FakeConnection(rows=[{"id": "1", "updated_at": None}])
+    pool = service.DatabasePool(connect=lambda: conn, min_size=0, max_size=1)
+    monkeypatch.setattr(service, "db_pool", pool)
+    monkeypatch.setattr(service, "db_executor", service.DatabaseExecutor(max_workers=2))
+    fetching, unblock, events = threading.Event(), threading.Event(), []
+    original_fetchmany, original_close = FakeCursor.fetchmany, FakeCursor.close
+
+    def blocking_fetchmany(self, size=1):
+        fetching.set()
+        unblock.wait(2)
+        events.append("fetched")
+        return original_fetchmany(self, size)
+
+    def recording_close(self):
+        events.append("closed")
+        original_close(self)
+
+    monkeypatch.setattr(FakeCursor, "fetchmany", blocking_fetchmany)
+    monkeypatch.setattr(FakeCursor, "close", recording_close)
+
+    async def scenario():
+        response = await service.export_table("courses", "ndjson", None)
+        body = response.body_iterator
+        pending = asyncio.create_task(body.__anext__())
+        await asyncio.to_thread(fetching.wait, 2)
+        pending.cancel()  # client went away mid-fetch
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        await asyncio.sleep(0.05)
+        return list(events), pool.stats()["in_use"]
+
+    during, in_use = asyncio.run(scenario())
+    unblock.set()
+    service.db_executor.shutdown()
+    assert during == [] and in_use == 1
+    assert events == ["fetched", "closed"]
+    assert pool.stats()["in_use"] == 0
+
+def test_export_csv_has_header_and_flattens_arrays(monkeypatch):
+    row = {column: None for column in service.JOB_COLUMNS}
+    row.update({"id": "1", "title": "Engineer", "skills": ["python", "sql"], "is_remote": True})
+    client, _ = export_client(monkeypatch, FakeConnection(rows=[row]))
+
+    response = client.get("/api/admin/jobs/export?format=csv")
+    service.db_executor.shutdown()
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    header, line = list(csv.reader(io.StringIO(response.text)))
+    assert header == list(service.JOB_COLUMNS)
+    record = dict(zip(header, line))
+    assert record["skills"] == '["python", "sql"]' and record["is_remote"] == "True"
+
+def test_export_rejects_invalid_since(monkeypatch):
+    client, _ = export_client(monkeypatch, FakeConnection())
+    response = client.get("/api/admin/blog/export?since=yesterday")
+    service.db_executor.shutdown()
+    assert response.status_code == 400
+
+def test_export_stream_is_compressed_when_accepted(monkeypatch):
+    from datetime import datetime
+
+    rows = [
+        {"id": str(i), "title": f"Course {i}", "description": "long text " * 50, "updated_at": datetime(2024, 1, 1)}
+        for i in range(5)
+    ]
+    client, _ = export_client(monkeypatch, FakeConnection(rows=rows))
+
+    with client.stream("GET", "/api/admin/courses/export", headers={"Accept-Encoding": "gzip"}) as response:
+        lines = [json.loads(line) for line in response.iter_lines()]
+        downloaded = response.num_bytes_downloaded
+    plain = client.get("/api/admin/courses/export", headers={"Accept-Encoding": "identity"})
+    service.db_executor.shutdown()
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers
+    assert [line["id"] for line in lines] == ["0", "1", "2", "3", "4"]
+    assert downloaded < len(plain.content) / 5
+
+def test_list_responses_serialize_native_types_with_orjson(monkeypatch):
+    import fastapi.routing
+    from datetime import datetime
+    from decimal import Decimal
+
+    def no_jsonable_encoder(*args, **kwargs):
+        raise AssertionError("dict results should bypass jsonable_encoder")
+
+    monkeypatch.setattr(fastapi.routing, "jsonable_encoder", no_jsonable_encoder)
+    row_id = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    rows = [{"id": row_id, "title": "Course", "price": Decimal("999.50"), "duration_weeks": Decimal("12"),
+             "created_at": datetime(2024, 1, 2, 3, 4, 5)}]
+    client, _ = export_client(monkeypatch, FakeConnection(rows=rows))
+
+    response = client.get("/api/admin/courses?limit=10")
+    service.db_executor.shutdown()
+
+    assert response.status_code == 200
+    assert response.json()["courses"] == [{
+        "id": str(row_id), "title": "Course", "price": 999.5, "duration_weeks": 12,
+        "created_at": "2024-01-02T03:04:05"
+    }]
+
+def test_list_endpoints_emit_validators_and_304(monkeypatch):
+    from datetime import datetime
+
+    rows = [{"id": "1", "title": "Engineer", "created_at": datetime(2024, 1, 1), "updated_at": datetime(2024, 3, 1, 12)}]
+    conn = FakeConnection(rows=rows)
+    client, _ = export_client(monkeypatch, conn)
+
+    first = client.get("/api/admin/jobs")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"1-') and "last-modified" not in first.headers
+    assert first.json()["jobs"][0]["updated_at"] == "2024-03-01T12:00:00"
+
+    assert client.get("/api/admin/jobs", headers={"If-None-Match": etag}).status_code == 304
+    # Lists are validated by ETag only
+    assert client.get("/api/admin/jobs", headers={"If-Modified-Since": "Fri, 01 Mar 2024 12:00:00 GMT"}).status_code == 200
+    assert client.get("/api/admin/jobs?limit=10", headers={"If-None-Match": etag}).status_code == 200
+
+    rows[0]["updated_at"] = datetime(2024, 3, 2)
+    changed = client.get("/api/admin/jobs", headers={"If-None-Match": etag})
+    service.db_executor.shutdown()
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+def test_handlers_answer_503_when_the_pool_is_exhausted(monkeypatch):
+    client, pool = export_client(monkeypatch, FakeConnection())
+    pool.timeout = 0.05
+    held = pool.acquire()
+
+    created = client.post("/api/admin/testimonials", json={"client_name": "Ada", "testimonial_text": "Great"})
+    listed = client.get("/api/admin/jobs")
+    pool.release(held)
+    service.db_executor.shutdown()
+
+    assert created.status_code == 503 and listed.status_code == 503
+    assert created.json()["detail"].startswith("Database connection unavailable")
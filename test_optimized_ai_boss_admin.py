@@ -0,0 +1,1460 @@
+#!/usr/bin/env python3
+"""
+AI Boss Admin - Unit Tests
+Exercises OptimizedAIBossAdmin against an in-process mock of Supabase
+PostgREST, so no running service or database is needed.
+
+Run with: python3 -m pytest test_optimized_ai_boss_admin.py
+"""
+
+import asyncio
+import json
+import re
+import time
+
+import httpx
+
+import optimized_ai_boss_admin as service
+
+def make_agent(handler):
+    """Build an admin agent whose pooled client talks to `handler`"""
+    client = service.SupabaseClient("https://supabase.test", transport=httpx.MockTransport(handler))
+    return service.OptimizedAIBossAdmin(http_client=client)
+
+def sample_course(**overrides):
+    course = {
+        "title": "Advanced Mathematics",
+        "description": "A thorough course on algebra and calculus",
+        "subject": "Mathematics",
+        "grade_level": "Class 11th CBSE",
+        "target_audience": "Class 11th students",
+        "instructor_name": "Dr. Expert",
+        "course_duration": "12 weeks",
+        "price": 999,
+    }
+    course.update(overrides)
+    return course
+
+class FakeCourseTable:
+    """Tiny PostgREST stand-in for /rest/v1/courses (id/limit/offset/keyset)"""
+    KEYSET = re.compile(
+        r'or\(created_at\.(lt|gt)\."([^"]+)",id\.(?:lt|gt)\."([^"]+)"\)'
+    )
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def insert(self, row):
+        self.rows.append(row)
+
+    def __call__(self, request: httpx.Request):
+        params = request.url.params
+        rows = sorted(self.rows, key=lambda r: (r["created_at"], r["id"]), reverse=True)
+        if params.get("id"):
+            rows = [r for r in rows if params["id"] == f'eq."{r["id"]}"']
+        keyset = self.KEYSET.search(params.get("and", ""))
+        if keyset:
+            op, created_at, course_id = keyset.groups()
+            position = (created_at, course_id)
+            assert params.get("created_at") == f'{op}e."{created_at}"'
+            if op == "lt":
+                rows = [r for r in rows if (r["created_at"], r["id"]) < position]
+            else:
+                rows = [r for r in rows if (r["created_at"], r["id"]) > position]
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 50))
+        return httpx.Response(200, json=rows[offset:offset + limit])
+
+def course_row(i):
+    return {"id": f"{i:08d}", "title": f"Course {i}", "created_at": f"2024-01-01T00:00:{i:02d}+00:00"}
+
+# ================================
+# POOLED HTTP CLIENT
+# ================================
+
+def test_admin_methods_share_pooled_client():
+    seen = []
+
+    def handler(request: httpx.Request):
+        seen.append((request.method, request.url.path))
+        if request.method == "POST":
+            return httpx.Response(201, json=[json.loads(request.content)])
+        return httpx.Response(200, json=[])
+
+    async def scenario():
+        agent = make_agent(handler)
+        await agent.http.start()
+        pooled = agent.http._client
+        assert (await agent.create_course(sample_course()))["success"]
+        assert (await agent.get_courses())["success"]
+        assert (await agent.update_course("abc", {"price": 10}))["success"]
+        assert (await agent.delete_course("abc"))["success"]
+        assert (await agent.create_instagram_post({"url": "https://instagram.com/p/x"}))["success"]
+        assert agent.http._client is pooled
+        await agent.http.close()
+        assert agent.http._client is None
+
+    asyncio.run(scenario())
+    assert [method for method, _ in seen] == ["POST", "GET", "PATCH", "DELETE", "POST"]
+    assert seen[-1][1] == "/rest/v1/instagram_posts"
+
+def test_concurrent_calls_do_not_block_event_loop():
+    async def handler(request: httpx.Request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=[])
+
+    async def scenario():
+        agent = make_agent(handler)
+        start = asyncio.get_running_loop().time()
+        await asyncio.gather(*(agent.get_courses() for _ in range(20)))
+        elapsed = asyncio.get_running_loop().time() - start
+        await agent.http.close()
+        return elapsed
+
+    # 20 sequential round trips would take >= 1s
+    assert asyncio.run(scenario()) < 0.5
+
+# ================================
+# SUPABASE RESILIENCE
+# ================================
+
+def test_reads_retry_with_backoff_and_writes_do_not():
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request.method)
+        if request.method == "GET" and calls.count("GET") < 3:
+            raise httpx.ConnectError("connection refused")
+        if request.method == "POST":
+            return httpx.Response(503, text="unavailable")
+        return httpx.Response(200, json=[{"id": "1"}])
+
+    async def scenario():
+        client = service.SupabaseClient("https://supabase.test", transport=httpx.MockTransport(handler),
+                                        retry_base=0)
+        agent = service.OptimizedAIBossAdmin(http_client=client)
+        listed = await agent.get_courses({"limit": 1})
+        created = await agent.create_course(sample_course())
+        await client.close()
+        return client, listed, created
+
+    client, listed, created = asyncio.run(scenario())
+    assert listed["success"] and listed["count"] == 1
+    assert created["code"] == "DATABASE_ERROR"
+    assert calls == ["GET", "GET", "GET", "POST"]
+    assert client.stats()["retries"] == 2 and client.stats()["failures"] == 3
+
+def test_circuit_breaker_counts_one_failure_per_call_not_per_retry():
+    outcomes = []
+
+    def handler(request: httpx.Request):
+        outcome = outcomes.pop(0)
+        if outcome == "down":
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(200, json=[])
+
+    async def scenario():
+        breaker = service.CircuitBreaker(threshold=2, cooldown=30)
+        client = service.SupabaseClient("https://supabase.test", transport=httpx.MockTransport(handler),
+                                        retry_base=0, breaker=breaker)
+        # Two failed attempts, then the retry succeeds
+        outcomes.extend(["down", "down", "ok"])
+        recovered = await client.get("/rest/v1/courses")
+        after_recovery = (breaker.state, breaker.consecutive_failures)
+        # Every retry fails: still one failure for the call
+        outcomes.extend(["down"] * 3)
+        try:
+            await client.get("/rest/v1/courses")
+        except httpx.ConnectError:
+            pass
+        after_exhausted = (breaker.state, breaker.consecutive_failures)
+        await client.close()
+        return recovered, after_recovery, after_exhausted
+
+    recovered, after_recovery, after_exhausted = asyncio.run(scenario())
+    assert recovered.status_code == 200 and after_recovery == ("closed", 0)
+    assert after_exhausted == ("closed", 1)
+
+def test_circuit_breaker_fails_fast_then_probes_and_closes():
+    calls = []
+    healthy = False
+
+    def handler(request: httpx.Request):
+        calls.append(request.method)
+        if not healthy:
+            return httpx.Response(500, text="boom")
+        return httpx.Response(200, json=[])
+
+    async def scenario():
+        nonlocal healthy
+        breaker = service.CircuitBreaker(threshold=2, cooldown=30)
+        client = service.SupabaseClient("https://supabase.test", transport=httpx.MockTransport(handler),
+                                        breaker=breaker)
+        agent = service.OptimizedAIBossAdmin(http_client=client)
+        agent.course_cache.ttl = 0
+        await agent.get_courses()
+        await agent.get_courses()
+        sent_before_open = len(calls)
+        rejected = await agent.get_courses()
+        status = await agent.get_system_status()
+        # After the cooldown a single probe is let through and closes the circuit
+        healthy = True
+        breaker.opened_at -= 31
+        probed = await agent.get_courses()
+        await client.close()
+        return breaker, sent_before_open, rejected, status, probed
+
+    breaker, sent_before_open, rejected, status, probed = asyncio.run(scenario())
+    assert sent_before_open == 2 and len(calls) == 3
+    assert rejected["success"] is False and "circuit open" in rejected["error"]
+    assert status["system"]["supabase_circuit"] == "open"
+    circuit = status["performance"]["supabase"]["circuit_breaker"]
+    assert circuit["times_opened"] == 1 and circuit["rejected_calls"] == 1 and circuit["retry_in_seconds"] > 0
+    assert probed["success"] and breaker.state == "closed" and breaker.consecutive_failures == 0
+
+# ================================
+# HEALTH SNAPSHOT
+# ================================
+
+def test_health_check_is_read_only_and_rls_probe_is_rate_limited():
+    seen = []
+
+    def handler(request: httpx.Request):
+        seen.append((request.method, request.headers.get("prefer", "")))
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={"content-range": "*/42"})
+        return httpx.Response(201, json=[{"id": "probe"}], headers={"preference-applied": "tx=rollback"})
+
+    async def scenario():
+        agent = make_agent(handler)
+        first = await agent.refresh_health_snapshot()
+        second = await agent.refresh_health_snapshot()
+        await agent.http.close()
+        return agent, first, second
+
+    agent, first, second = asyncio.run(scenario())
+    assert first["course_count"] == 42 and first["rls_policy"] == "working"
+    assert second["rls_policy"] == "working"
+    # Two probes, one RLS check, and the RLS check never commits
+    assert [method for method, _ in seen] == ["HEAD", "POST", "HEAD"]
+    assert "tx=rollback" in seen[1][1]
+    assert "DELETE" not in [method for method, _ in seen]
+    assert agent.get_health_snapshot()["snapshot_age_seconds"] >= 0
+
+def test_health_endpoint_answers_from_snapshot():
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request.method)
+        return httpx.Response(200, headers={"content-range": "*/0"})
+
+    async def scenario():
+        agent = make_agent(handler)
+        await agent.refresh_health_snapshot()
+        before = len(calls)
+        for _ in range(100):
+            snapshot = agent.get_health_snapshot()
+        await agent.http.close()
+        return before, snapshot
+
+    before, snapshot = asyncio.run(scenario())
+    assert len(calls) == before
+    assert snapshot["database"] == "connected"
+
+# ================================
+# COURSE LISTING CACHE
+# ================================
+
+def test_get_courses_is_cached_until_a_write_succeeds():
+    gets = []
+
+    def handler(request: httpx.Request):
+        if request.method == "GET":
+            gets.append(str(request.url))
+            return httpx.Response(200, json=[{"id": "1", "title": "Cached"}])
+        if request.method == "POST":
+            return httpx.Response(201, json=[json.loads(request.content)])
+        return httpx.Response(204)
+
+    async def scenario():
+        agent = make_agent(handler)
+        first = await agent.get_courses({"subject": "Mathematics", "limit": 50})
+        second = await agent.get_courses({"limit": 50, "subject": "Mathematics", "search": None})
+        await agent.update_course("1", {"price": 5})
+        third = await agent.get_courses({"subject": "Mathematics", "limit": 50})
+        await agent.http.close()
+        return agent, first, second, third
+
+    agent, first, second, third = asyncio.run(scenario())
+    assert (first["cached"], second["cached"], third["cached"]) == (False, True, False)
+    assert len(gets) == 2
+    stats = agent.course_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["invalidations"] == 1
+
+def test_response_cache_bounds_entries_and_bytes():
+    cache = service.ResponseCache(ttl=60, max_entries=2, max_bytes=10_000)
+    for i in range(3):
+        cache.set(f"k{i}", {"data": i})
+    assert cache.get("k0") is None
+    assert cache.stats()["evictions"] == 1
+
+    cache = service.ResponseCache(ttl=60, max_entries=100, max_bytes=200)
+    for i in range(5):
+        cache.set(f"k{i}", {"data": "x" * 60})
+    assert cache.stats()["bytes"] <= 200
+    assert cache.stats()["evictions"] >= 3
+
+def test_response_cache_skips_stale_generation():
+    cache = service.ResponseCache(ttl=60)
+    generation = cache.generation
+    cache.invalidate()
+    cache.set("k", {"data": 1}, generation)
+    assert cache.get("k") is None
+
+# ================================
+# KEYSET PAGINATION
+# ================================
+
+def test_cursor_pages_are_stable_under_concurrent_inserts():
+    table = FakeCourseTable(course_row(i) for i in range(10))
+
+    async def scenario():
+        agent = make_agent(table)
+        agent.course_cache.ttl = 0
+        seen, cursor, new_id = [], None, 100
+        for _ in range(20):
+            filters = {"limit": 3, "pagination": "cursor"}
+            if cursor:
+                filters["cursor"] = cursor
+            page = await agent.get_courses(filters)
+            assert page["success"], page
+            seen.extend(row["id"] for row in page["data"])
+            # Newer rows land at the head of the listing between page loads
+            table.insert({"id": f"{new_id:08d}", "title": "New", "created_at": f"2024-01-02T00:00:{new_id % 60:02d}+00:00"})
+            new_id += 1
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        await agent.http.close()
+        return seen
+
+    seen = asyncio.run(scenario())
+    assert seen == [f"{i:08d}" for i in reversed(range(10))]
+
+def test_offset_pagination_remains_default():
+    table = FakeCourseTable(course_row(i) for i in range(5))
+
+    async def scenario():
+        agent = make_agent(table)
+        page = await agent.get_courses({"limit": 2, "offset": 2})
+        await agent.http.close()
+        return page
+
+    page = asyncio.run(scenario())
+    assert [row["id"] for row in page["data"]] == ["00000002", "00000001"]
+    assert "next_cursor" not in page
+
+def test_invalid_cursor_is_a_validation_error():
+    async def scenario():
+        agent = make_agent(lambda request: httpx.Response(200, json=[]))
+        result = await agent.get_courses({"cursor": "not-a-cursor"})
+        await agent.http.close()
+        return result
+
+    assert asyncio.run(scenario())["code"] == "VALIDATION_ERROR"
+
+# ================================
+# COURSE SEARCH
+# ================================
+
+def test_search_uses_ranked_rpc_with_encoded_term():
+    seen = []
+
+    def handler(request: httpx.Request):
+        seen.append(request.url)
+        return httpx.Response(200, json=[course_row(2), course_row(1)])
+
+    async def scenario():
+        agent = make_agent(handler)
+        result = await agent.get_courses({"search": "calc, (intro) & 50%", "subject": "Math", "published": True, "limit": 2})
+        with_cursor = await agent.get_courses({"search": "calc", "pagination": "cursor"})
+        await agent.http.close()
+        return result, with_cursor
+
+    result, with_cursor = asyncio.run(scenario())
+    url = seen[0]
+    assert url.path == "/rest/v1/rpc/search_courses"
+    assert dict(url.params) == {
+        "q": "calc, (intro) & 50%", "subject_filter": "Math", "published_filter": "true",
+        "result_limit": "2", "result_offset": "0"
+    }
+    assert url.query.count(b"&") == 4  # the & in the term is encoded
+    assert result["search"] == "ranked" and [c["id"] for c in result["data"]] == ["00000002", "00000001"]
+    assert with_cursor["code"] == "VALIDATION_ERROR" and len(seen) == 1
+
+def test_search_passes_price_range_to_rpc_and_rejects_ordering():
+    seen = []
+
+    def handler(request: httpx.Request):
+        seen.append(request.url)
+        return httpx.Response(200, json=[course_row(1)])
+
+    async def scenario():
+        agent = make_agent(handler)
+        priced = await agent.get_courses({"search": "calc", "min_price": 10, "max_price": 99.5})
+        ordered = await agent.get_courses({"search": "calc", "order_by": "price", "order_direction": "asc"})
+        await agent.http.close()
+        return priced, ordered
+
+    priced, ordered = asyncio.run(scenario())
+    assert priced["success"] and len(seen) == 1
+    assert (seen[0].params["min_price"], seen[0].params["max_price"]) == ("10", "99.5")
+    assert ordered["code"] == "VALIDATION_ERROR" and "order_by" in ordered["error"]
+
+def test_search_falls_back_to_quoted_ilike_without_rpc_then_reprobes():
+    seen = []
+    installed = False
+
+    def handler(request: httpx.Request):
+        seen.append(request.url)
+        if request.url.path.startswith("/rest/v1/rpc/") and not installed:
+            return httpx.Response(404, json={"code": "PGRST202"})
+        return httpx.Response(200, json=[course_row(1)])
+
+    async def scenario():
+        nonlocal installed
+        agent = make_agent(handler)
+        agent.course_cache.ttl = 0
+        first = await agent.get_courses({"search": 'a,b"c'})
+        second = await agent.get_courses({"search": "algebra"})
+        # The migration is applied; after the retry delay the RPC is probed again
+        installed = True
+        agent.search_rpc_retry_at = time.monotonic() - 1
+        third = await agent.get_courses({"search": "algebra"})
+        await agent.http.close()
+        return agent, first, second, third
+
+    agent, first, second, third = asyncio.run(scenario())
+    assert first["success"] and second["success"] and "search" not in second
+    assert third["search"] == "ranked" and agent.search_mode == "rpc" and agent.search_rpc_retry_at is None
+    assert [url.path for url in seen] == [
+        "/rest/v1/rpc/search_courses", "/rest/v1/courses", "/rest/v1/courses", "/rest/v1/rpc/search_courses"
+    ]
+    assert seen[1].params["or"] == '(title.ilike."*a,b\\"c*",description.ilike."*a,b\\"c*")'
+
+# ================================
+# COURSE REPLICA
+# ================================
+
+class FakeReplicatedTables:
+    """PostgREST stand-in for the replica's id-ordered and updated_at-window pages"""
+    def __init__(self, courses):
+        self.tables = {"courses": {row["id"]: row for row in courses}}
+        self.gets = []
+
+    def __call__(self, request: httpx.Request):
+        table = request.url.path.rsplit("/", 1)[-1]
+        params = request.url.params
+        self.gets.append(table)
+        if table not in self.tables:
+            return httpx.Response(200, json=[])
+        if request.method == "PATCH":
+            course_id = params["id"].split(".", 1)[1]
+            row = {**self.tables[table][course_id], **json.loads(request.content)}
+            self.tables[table][course_id] = row
+            return httpx.Response(200, json=[row])
+        rows = list(self.tables[table].values())
+        if "updated_at" in params:
+            since = service.as_utc(params["updated_at"].split(".", 1)[1].strip('"'))
+            rows = sorted((r for r in rows if service.as_utc(r["updated_at"]) >= since),
+                          key=lambda r: (r["updated_at"], r["id"]))
+        else:
+            rows = sorted(rows, key=lambda r: r["id"])
+            if "id" in params:
+                rows = [r for r in rows if r["id"] > params["id"].split(".", 1)[1].strip('"')]
+        return httpx.Response(200, json=rows[:int(params.get("limit", 1000))])
+
+def replicated_course(i, **overrides):
+    row = {
+        "id": f"{i:08d}", "title": f"Course {i}", "description": "algebra" if i % 2 else "optics",
+        "subject": "Mathematics" if i % 2 else "Physics", "price": i * 100, "is_published": i % 3 == 0,
+        "is_featured": False, "created_at": f"2024-01-01T00:00:{i:02d}+00:00",
+        "updated_at": f"2024-01-01T00:00:{i:02d}+00:00",
+    }
+    row.update(overrides)
+    return row
+
+def make_replica_agent(table, **options):
+    agent = make_agent(table)
+    agent.course_cache.ttl = 0
+    agent.course_replica = service.CourseReplica(agent.http, agent.get_headers, enabled=True, path=":memory:",
+                                                 page_size=4, **options)
+    agent.course_replica.open()
+    return agent
+
+def test_replica_serves_filters_and_cursor_pages_like_supabase():
+    table = FakeReplicatedTables(replicated_course(i) for i in range(10))
+
+    async def scenario():
+        agent = make_replica_agent(table)
+        await agent.course_replica.sync(full=True)
+        table.gets.clear()
+        physics = await agent.get_courses({"subject": "Physics", "limit": 2, "offset": 1})
+        priced = await agent.get_courses({"min_price": 300, "max_price": 600, "published": True})
+        seen, cursor = [], None
+        while True:
+            page = await agent.get_courses({"limit": 4, "pagination": "cursor", **({"cursor": cursor} if cursor else {})})
+            seen.extend(row["id"] for row in page["data"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        ranked = await agent.get_courses({"search": "algebra"})
+        await agent.http.close()
+        return agent, physics, priced, seen, ranked
+
+    agent, physics, priced, seen, ranked = asyncio.run(scenario())
+    assert physics["source"] == "replica"
+    assert [row["id"] for row in physics["data"]] == ["00000006", "00000004"]
+    assert [row["id"] for row in priced["data"]] == ["00000006", "00000003"]
+    assert seen == [f"{i:08d}" for i in reversed(range(10))]
+    # Ranked search is Supabase-only; everything else never left the process
+    assert "source" not in ranked and table.gets == ["search_courses"]
+    stats = agent.course_replica.stats()
+    assert stats["tables"]["courses"]["rows"] == 10
+    assert stats["fallbacks"] == {"ranked_search": 1}
+
+def test_replica_syncs_increments_reads_own_writes_and_bounds_staleness():
+    table = FakeReplicatedTables(replicated_course(i) for i in range(3))
+
+    async def scenario():
+        agent = make_replica_agent(table, max_staleness=60)
+        replica = agent.course_replica
+        await replica.sync(full=True)
+        # A change made elsewhere shows up on the next incremental sync
+        table.tables["courses"]["00000001"] = replicated_course(1, title="Renamed", updated_at="2024-01-01T00:01:00+00:00")
+        await replica.sync()
+        renamed = await agent.get_courses({"limit": 10})
+        # Local writes are visible immediately
+        await agent.update_course("00000002", {"price": 1})
+        await agent.delete_course("00000000")
+        after_write = await agent.get_courses({"limit": 10})
+        # Past the staleness bound reads go back to Supabase
+        replica.tables["courses"]["last_sync"] -= 120
+        stale = await agent.get_courses({"limit": 10})
+        await agent.http.close()
+        return replica, renamed, after_write, stale
+
+    replica, renamed, after_write, stale = asyncio.run(scenario())
+    assert renamed["source"] == "replica"
+    assert {row["id"]: row["title"] for row in renamed["data"]}["00000001"] == "Renamed"
+    assert [(row["id"], row["price"]) for row in after_write["data"]] == [("00000002", 1), ("00000001", 100)]
+    assert "source" not in stale
+    stats = replica.stats()
+    assert stats["fallbacks"] == {"stale": 1} and stats["local_writes"] == 2
+    assert stats["fresh"] is False and stats["sync_lag_seconds"] >= 120
+
+def test_replica_mirrors_only_courses_and_writes_utc_timestamps():
+    table = FakeReplicatedTables([replicated_course(1)])
+
+    async def scenario():
+        agent = make_replica_agent(table)
+        table.gets.clear()
+        await agent.course_replica.sync(full=True)
+        await agent.course_replica.sync()
+        record = agent._prepare_course_record(sample_course())
+        await agent.http.close()
+        return agent.course_replica, record
+
+    replica, record = asyncio.run(scenario())
+    # Nothing reads modules or topics from the mirror, so they are not synced
+    assert set(table.gets) == {"courses"} and list(replica.stats()["tables"]) == ["courses"]
+    assert service.as_utc(record["created_at"]).utcoffset().total_seconds() == 0
+    assert record["created_at"].endswith("+00:00") and record["updated_at"] == record["created_at"]
+
+# ================================
+# WRITE-BEHIND QUEUE
+# ================================
+
+class FlakySupabaseInserts:
+    """Records upserts by id; fails the first `outages` calls, optionally after committing"""
+    def __init__(self, outages=0, commit_before_failing=False, reject_title=None):
+        self.outages = outages
+        self.commit_before_failing = commit_before_failing
+        self.reject_title = reject_title
+        self.rows = {}
+        self.calls = []
+
+    def __call__(self, request: httpx.Request):
+        if request.method == "GET":  # no OpenAPI description: the default columns apply
+            return httpx.Response(404)
+        body = json.loads(request.content)
+        self.calls.append((request.url.path, request.url.params.get("on_conflict"), request.headers.get("prefer"), body))
+        if self.outages and not self.commit_before_failing:
+            self.outages -= 1
+            return httpx.Response(503, text="upstream unavailable")
+        if self.reject_title and any(row.get("title") == self.reject_title for row in body):
+            return httpx.Response(400, json={"message": "bad row"})
+        created = [row for row in body if row["id"] not in self.rows]
+        self.rows.update((row["id"], row) for row in created)
+        if self.outages:
+            self.outages -= 1
+            raise httpx.ReadTimeout("response lost")
+        return httpx.Response(201, json=created)
+
+def make_queue_agent(handler, path):
+    agent = make_agent(handler)
+    agent.write_queue = service.WriteBehindQueue(agent.http, agent.get_headers, enabled=True, path=str(path),
+                                                 retry_base=0)
+    agent.write_queue.on_committed = agent._write_committed
+    return agent
+
+def test_write_behind_acknowledges_during_outage_and_drains_in_batches(tmp_path):
+    upstream = FlakySupabaseInserts(outages=2)
+
+    async def scenario():
+        agent = make_queue_agent(upstream, tmp_path / "writes.db")
+        acks = [await agent.create_course(sample_course(title=f"Queued {i}")) for i in range(3)]
+        acks.append(await agent.create_instagram_post({"url": "https://instagram.com/p/Cx1", "tags": ["#ai"]}))
+        invalid = await agent.create_course(sample_course(subject="Astrology"))
+        queued = {**agent.write_queue.stats(), "sent": len(upstream.calls)}
+        await agent.write_queue.drain()  # Supabase down: deferred
+        deferred = agent.write_queue.stats()
+        await agent.write_queue.drain()
+        state = agent.write_queue.lookup(acks[0]["pending_id"])
+        await agent.write_queue.stop()
+        await agent.http.close()
+        return agent, acks, invalid, queued, deferred, state
+
+    agent, acks, invalid, queued, deferred, state = asyncio.run(scenario())
+    assert all(ack["success"] and ack["pending"] for ack in acks)
+    assert invalid["code"] == "VALIDATION_ERROR"
+    assert queued["depth"] == 4 and queued["sent"] == 0
+    assert deferred["depth"] == 4 and deferred["retries"] == 4 and "503" in deferred["last_error"]
+    # One array insert per table, keyed by the pending ids
+    paths = [call[0] for call in upstream.calls[2:]]
+    assert paths == ["/rest/v1/courses", "/rest/v1/instagram_posts"]
+    assert [call[1] for call in upstream.calls[2:]] == ["id", "post_id"]
+    assert all("resolution=ignore-duplicates" in prefer for _, _, prefer, _ in upstream.calls)
+    post = upstream.calls[-1][3][0]
+    assert (post["post_id"], post["post_type"], post["hashtags"]) == ("Cx1", "image", ["ai"])
+    assert set(upstream.rows) == {ack["pending_id"] for ack in acks}
+    stats = agent.write_queue.stats()
+    assert stats["depth"] == 0 and stats["committed"] == 4 and stats["drain_rate_per_second"] > 0
+    assert state["status"] == "done" and state["attempts"] == 2
+    assert agent.course_cache.stats()["invalidations"] == 1
+
+def test_write_behind_survives_restart_and_resends_idempotently(tmp_path):
+    path = tmp_path / "writes.db"
+    # The first send commits upstream but the response is lost
+    upstream = FlakySupabaseInserts(outages=1, commit_before_failing=True, reject_title="Rejected")
+
+    async def scenario():
+        first = make_queue_agent(upstream, path)
+        ack = await first.create_course(sample_course(title="Survivor"))
+        await first.create_course(sample_course(title="Rejected"))
+        await first.write_queue.stop()  # process exits before draining
+        await first.http.close()
+
+        second = make_queue_agent(upstream, path)
+        await second.write_queue.start()
+        restored = second.write_queue.stats()["depth"]
+        await second.write_queue.drain()  # commits, then times out
+        await second.write_queue.drain()  # resent: duplicate ignored, bad row split out
+        stats = second.write_queue.stats()
+        await second.write_queue.stop()
+        await second.http.close()
+        return ack, restored, stats
+
+    ack, restored, stats = asyncio.run(scenario())
+    assert restored == 2
+    assert list(upstream.rows) == [ack["pending_id"]]
+    assert stats["depth"] == 0 and stats["failed"] == 1 and stats["dead_letters"] == 1
+    assert "bad row" in stats["last_error"]
+
+def test_write_behind_rejects_unknown_columns_and_redrives_failed_writes(tmp_path):
+    upstream = FlakySupabaseInserts(reject_title="Rejected")
+
+    async def scenario():
+        agent = make_queue_agent(upstream, tmp_path / "writes.db")
+        unknown = await agent._queue_write("courses", {"title": "T", "description": "D", "status": "x"}, "queued")
+        not_a_post = await agent.create_instagram_post({"url": "https://example.com/p/1"})
+        rejected = await agent.create_course(sample_course(title="Rejected"))
+        await agent.write_queue.drain()
+        failed = agent.write_queue.failed()
+        upstream.reject_title = None  # the upstream problem is fixed
+        requeued = agent.write_queue.redrive([rejected["pending_id"]])
+        await agent.write_queue.drain()
+        stats = agent.write_queue.stats()
+        await agent.write_queue.stop()
+        await agent.http.close()
+        return unknown, not_a_post, rejected, failed, requeued, stats
+
+    unknown, not_a_post, rejected, failed, requeued, stats = asyncio.run(scenario())
+    assert unknown["code"] == "VALIDATION_ERROR" and "status" in unknown["error"]
+    assert not_a_post["code"] == "VALIDATION_ERROR"
+    assert [write["id"] for write in failed] == [rejected["pending_id"]]
+    assert failed[0]["record"]["title"] == "Rejected"
+    assert requeued == 1
+    assert list(upstream.rows) == [rejected["pending_id"]]
+    assert stats["depth"] == 0 and stats["failed"] == 0
+
+def test_write_behind_waits_out_open_circuit_without_spending_attempts(tmp_path):
+    upstream = FlakySupabaseInserts()
+
+    async def scenario():
+        agent = make_queue_agent(upstream, tmp_path / "writes.db")
+        agent.write_queue.max_attempts = 1
+        ack = await agent.create_course(sample_course(title="Held"))
+        breaker = agent.http.breaker
+        for _ in range(breaker.threshold):
+            breaker.record_failure("down")
+        await agent.write_queue.drain()
+        held = agent.write_queue.lookup(ack["pending_id"])
+        breaker.record_success()
+        agent.write_queue._execute("UPDATE writes SET next_attempt_at = 0")
+        await agent.write_queue.drain()
+        done = agent.write_queue.lookup(ack["pending_id"])
+        await agent.write_queue.stop()
+        await agent.http.close()
+        return held, done
+
+    held, done = asyncio.run(scenario())
+    assert upstream.calls[0][3][0]["title"] == "Held" and len(upstream.calls) == 1
+    assert (held["status"], held["attempts"]) == ("pending", 0) and "circuit" in held["last_error"].lower()
+    assert (done["status"], done["attempts"]) == ("done", 1)
+
+# ================================
+# BULK IMPORT
+# ================================
+
+def test_bulk_import_batches_rows_and_reports_per_row_results():
+    posts = []
+
+    def handler(request: httpx.Request):
+        body = json.loads(request.content)
+        posts.append(body)
+        return httpx.Response(201, json=[{**row, "id": f"id-{len(posts)}-{i}"} for i, row in enumerate(body)])
+
+    rows = [sample_course(title=f"Course {i}") for i in range(5)]
+    rows.insert(2, sample_course(subject="Astrology"))
+    batches = []
+
+    async def on_batch(created):
+        batches.append(len(created))
+
+    async def scenario():
+        agent = make_agent(handler)
+        result = await agent.create_courses_bulk(rows, batch_size=2, on_batch=on_batch)
+        await agent.http.close()
+        return result
+
+    result = asyncio.run(scenario())
+    assert (result["total"], result["created"], result["failed"]) == (6, 5, 1)
+    assert [len(body) for body in posts] == [2, 2, 1]
+    assert batches == [2, 2, 1]
+    assert result["results"][2]["code"] == "VALIDATION_ERROR"
+    assert [r["index"] for r in result["results"]] == list(range(6))
+
+def test_bulk_import_marks_rows_missing_from_the_response_as_failed():
+    def handler(request: httpx.Request):
+        body = json.loads(request.content)
+        # A trigger skipped "Course 1": PostgREST returns the other rows only
+        kept = [row for row in body if row["title"] != "Course 1"]
+        return httpx.Response(201, json=[{**row, "id": row["title"][-1]} for row in kept])
+
+    rows = [sample_course(title=f"Course {i}") for i in range(4)]
+
+    async def scenario():
+        agent = make_agent(handler)
+        result = await agent.create_courses_bulk(rows, batch_size=2)
+        await agent.http.close()
+        return result
+
+    result = asyncio.run(scenario())
+    assert (result["total"], result["created"], result["failed"]) == (4, 3, 1) and not result["success"]
+    assert [(r["success"], r.get("id")) for r in result["results"]] == [(True, "0"), (False, None), (True, "2"), (True, "3")]
+    assert result["results"][1]["title"] == "Course 1"
+
+def test_bulk_endpoint_accepts_ndjson_stream(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    def handler(request: httpx.Request):
+        body = json.loads(request.content)
+        return httpx.Response(201, json=[{**row, "id": str(i)} for i, row in enumerate(body)])
+
+    broadcasts = []
+
+    async def fake_broadcast(message):
+        broadcasts.append(message)
+
+    monkeypatch.setattr(service, "admin_agent", make_agent(handler))
+    monkeypatch.setattr(service.connection_manager, "broadcast", fake_broadcast)
+    body = "\n".join(json.dumps(sample_course(title=f"Course {i}")) for i in range(3)) + "\nnot json\n"
+
+    response = TestClient(service.app).post(
+        "/api/courses/bulk?batch_size=2",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    result = response.json()
+    assert (result["created"], result["failed"]) == (3, 1)
+    assert result["results"][3]["code"] == "PARSE_ERROR"
+    assert [m["type"] for m in broadcasts] == ["courses_created", "courses_created"]
+    assert [m["count"] for m in broadcasts] == [2, 1]
+
+# ================================
+# WEBSOCKET FAN-OUT
+# ================================
+
+class FakeWebSocket:
+    def __init__(self, blocked: bool = False):
+        self.frames = []
+        self.closed_with = None
+        self.unblock = asyncio.Event()
+        if not blocked:
+            self.unblock.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame):
+        await self.unblock.wait()
+        self.frames.append(frame)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+async def settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+def test_broadcast_serializes_once_and_slow_client_does_not_block_others(monkeypatch):
+    dumps_calls = []
+    real_dumps = service.dumps_json
+
+    def counting_dumps(obj):
+        dumps_calls.append(obj)
+        return real_dumps(obj)
+
+    monkeypatch.setattr(service, "dumps_json", counting_dumps)
+
+    async def scenario():
+        manager = service.ConnectionManager(queue_size=10)
+        fast = [FakeWebSocket() for _ in range(50)]
+        slow = FakeWebSocket(blocked=True)
+        for ws in fast + [slow]:
+            await manager.connect(ws)
+        dumps_calls.clear()
+        await manager.broadcast({"type": "course_created", "id": "1"})
+        await settle()
+        stats = manager.stats()
+        await manager.shutdown()
+        return fast, slow, stats
+
+    fast, slow, stats = asyncio.run(scenario())
+    assert len(dumps_calls) == 1
+    assert all(ws.frames == [fast[0].frames[0]] for ws in fast)
+    assert slow.frames == []
+    assert stats["frames_sent"] == 50 and stats["connections"] == 51
+
+def test_slow_consumer_policies():
+    async def run(policy):
+        manager = service.ConnectionManager(queue_size=2, slow_consumer_policy=policy)
+        slow = FakeWebSocket(blocked=True)
+        await manager.connect(slow)
+        # The writer picks up frame 0 and blocks on it; frames 1-4 contend for 2 slots
+        await manager.broadcast({"n": 0})
+        await settle()
+        for i in range(1, 5):
+            await manager.broadcast({"n": i})
+        queued = [json.loads(f)["n"] for f in list(manager.clients[slow].queue._queue)] if slow in manager.clients else None
+        await settle()
+        stats = manager.stats()
+        await manager.shutdown()
+        return slow, queued, stats
+
+    slow, queued, stats = asyncio.run(run("drop_oldest"))
+    assert queued == [3, 4] and stats["frames_dropped"] == 2
+
+    slow, queued, stats = asyncio.run(run("drop_newest"))
+    assert queued == [1, 2] and stats["frames_dropped"] == 2
+
+    slow, queued, stats = asyncio.run(run("disconnect"))
+    assert queued is None and slow.closed_with == 1013
+    assert stats["slow_consumers_disconnected"] == 1 and stats["connections"] == 0
+
+def test_failed_send_removes_client():
+    class BrokenWebSocket(FakeWebSocket):
+        async def send_text(self, frame):
+            raise RuntimeError("connection reset")
+
+    async def scenario():
+        manager = service.ConnectionManager()
+        broken = BrokenWebSocket()
+        await manager.connect(broken)
+        await manager.broadcast({"type": "ping"})
+        await settle()
+        return manager.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["connections"] == 0 and stats["send_failures"] == 1
+
+# ================================
+# WEBSOCKET TOPICS
+# ================================
+
+def test_broadcast_only_reaches_subscribed_clients():
+    async def scenario():
+        manager = service.ConnectionManager()
+        everything, by_type, by_course, by_subject = (FakeWebSocket() for _ in range(4))
+        for ws in (everything, by_type, by_course, by_subject):
+            await manager.connect(ws)
+        manager.subscribe(by_type, ["course_deleted"])
+        manager.subscribe(by_course, ["course:42"])
+        manager.subscribe(by_subject, ["subject:Physics"])
+
+        await manager.broadcast({"type": "course_updated", "course_id": "42", "data": {"price": 5}})
+        await manager.broadcast({"type": "course_created", "data": {"id": "7", "subject": "Physics"}})
+        await manager.broadcast({"type": "courses_created", "data": [{"id": "8", "subject": "Chemistry"}]})
+        await settle()
+        stats = manager.stats()
+        manager.unsubscribe(by_course, ["course:42"])
+        await manager.broadcast({"type": "course_deleted", "course_id": "42"})
+        await settle()
+        manager.disconnect(by_type)
+        after_disconnect = manager.stats()
+        await manager.shutdown()
+        return [
+            [json.loads(f)["type"] for f in ws.frames] for ws in (everything, by_type, by_course, by_subject)
+        ], stats, after_disconnect
+
+    received, stats, after_disconnect = asyncio.run(scenario())
+    assert received == [
+        ["course_updated", "course_created", "courses_created", "course_deleted"],
+        ["course_deleted"],
+        ["course_updated"],
+        ["course_created"],
+    ]
+    assert stats["topics"] == 4 and stats["subscriptions"] == 4
+    assert after_disconnect["topics"] == 2 and after_disconnect["subscriptions"] == 2
+
+def test_update_and_delete_events_reach_current_and_previous_subject(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    stored = {"id": "42", "title": "Optics", "subject": "Mathematics"}
+
+    def handler(request: httpx.Request):
+        if request.method == "GET":
+            assert request.url.params["select"] == "subject"
+            return httpx.Response(200, json=[{"subject": stored["subject"]}])
+        if request.method == "PATCH":
+            stored.update({k: v for k, v in json.loads(request.content).items() if k != "updated_at"})
+        return httpx.Response(200, json=[dict(stored)])
+
+    recorder = RecordingManager()
+    monkeypatch.setattr(service, "admin_agent", make_agent(handler))
+    monkeypatch.setattr(service, "broadcaster", recorder)
+    client = TestClient(service.app)
+
+    assert client.put("/api/courses/42", json={"subject": "Physics"}).json()["success"]
+    assert client.put("/api/courses/42", json={"price": 5}).json()["success"]
+    assert client.delete("/api/courses/42").json()["success"]
+
+    moved, priced, deleted = (service.message_topics(message) for message, _ in recorder.sent)
+    assert {"subject:Physics", "subject:Mathematics"} <= moved
+    # Neither event's data names the subject
+    assert "subject:Physics" in priced and "subject:Mathematics" not in priced
+    assert "subject:Physics" in deleted and deleted >= {"course_deleted", "course:42"}
+
+def test_websocket_control_protocol():
+    from fastapi.testclient import TestClient
+
+    with TestClient(service.app).websocket_connect("/ws") as ws:
+        ws.send_text(json.dumps({"action": "subscribe", "topics": ["course_deleted", "subject:Math"]}))
+        reply = ws.receive_json()
+        assert (reply["type"], reply["topics"]) == ("subscribed", ["course_deleted", "subject:Math"])
+
+        ws.send_text(json.dumps({"action": "unsubscribe", "topics": "subject:Math"}))
+        assert ws.receive_json()["topics"] == ["course_deleted"]
+
+        ws.send_text(json.dumps({"action": "subscribe", "topics": [1]}))
+        assert ws.receive_json()["code"] == "VALIDATION_ERROR"
+
+        # Plain text is no longer echoed; ping gets a pong
+        ws.send_text("hello")
+        ws.send_text(json.dumps({"type": "ping"}))
+        assert ws.receive_json()["type"] == "pong"
+
+# ================================
+# CROSS-WORKER EVENT BUS
+# ================================
+
+def event_bus_worker(worker_id, path, workers, ready, results):
+    """One 'uvicorn worker': its own ConnectionManager, socket and bus"""
+    async def run():
+        manager = service.ConnectionManager(event_bus=service.UnixSocketEventBus(path, retry_interval=0.05))
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        await manager.start()
+        await asyncio.get_running_loop().run_in_executor(None, ready.wait)
+        await manager.broadcast({"type": "course_created", "data": {"id": f"worker-{worker_id}"}})
+        for _ in range(200):
+            if len(ws.frames) >= workers:
+                break
+            await asyncio.sleep(0.02)
+        role = manager.event_bus.role
+        # Keep the broker up until every worker has its frames
+        await asyncio.get_running_loop().run_in_executor(None, ready.wait)
+        await manager.shutdown()
+        return role, sorted(json.loads(frame)["data"]["id"] for frame in ws.frames)
+
+    results.put((worker_id, *asyncio.run(run())))
+
+def test_unix_event_bus_delivers_across_worker_processes(tmp_path):
+    import multiprocessing
+
+    workers = 3
+    context = multiprocessing.get_context("spawn")
+    ready = context.Barrier(workers)
+    results = context.Queue()
+    path = str(tmp_path / "events.sock")
+    processes = [
+        context.Process(target=event_bus_worker, args=(i, path, workers, ready, results))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = sorted(results.get(timeout=30) for _ in range(workers))
+    for process in processes:
+        process.join(timeout=10)
+
+    expected = [f"worker-{i}" for i in range(workers)]
+    assert [received for _, _, received in outcomes] == [expected] * workers
+    assert sorted(role for _, role, _ in outcomes) == ["broker", "peer", "peer"]
+
+def test_cache_invalidation_reaches_other_workers_without_client_frames(tmp_path):
+    path = str(tmp_path / "events.sock")
+
+    async def scenario():
+        workers = []
+        for _ in range(2):
+            manager = service.ConnectionManager(event_bus=service.UnixSocketEventBus(path, retry_interval=0.05),
+                                                heartbeat_interval=0, idle_timeout=0)
+            cache = service.ResponseCache(ttl=60)
+            service.share_cache_invalidations(cache, manager)
+            ws = FakeWebSocket()
+            await manager.connect(ws)
+            await manager.start()
+            cache.set("listing", {"data": []})
+            workers.append((manager, cache, ws))
+        (first, first_cache, first_ws), (second, second_cache, second_ws) = workers
+
+        first_cache.invalidate()  # a write handled by the first worker
+        for _ in range(100):
+            if second_cache.remote_invalidations:
+                break
+            await asyncio.sleep(0.01)
+        await first.broadcast({"type": "course_created", "data": {"id": "1"}})
+        for _ in range(100):
+            if second_ws.frames:
+                break
+            await asyncio.sleep(0.01)
+        for manager, _, _ in workers:
+            await manager.shutdown()
+        return first_cache, second_cache, first_ws, second_ws
+
+    first_cache, second_cache, first_ws, second_ws = asyncio.run(scenario())
+    assert second_cache.get("listing") is None and second_cache.stats()["remote_invalidations"] == 1
+    # The publisher ignores its own echo
+    assert first_cache.stats()["invalidations"] == 1 and first_cache.stats()["remote_invalidations"] == 0
+    # Control events are not sent to sockets and do not use up client seq numbers
+    frames = [json.loads(frame) for frame in second_ws.frames]
+    assert [(frame["type"], frame["seq"]) for frame in frames] == [("course_created", 1)]
+
+def test_local_event_bus_is_the_default():
+    manager = service.ConnectionManager()
+    assert manager.stats()["event_bus"]["backend"] == "local"
+
+# ================================
+# BROADCAST COALESCING
+# ================================
+
+class RecordingManager:
+    def __init__(self):
+        self.sent = []
+
+    async def broadcast(self, message, topics=None):
+        self.sent.append((message, topics))
+
+def test_coalescer_merges_updates_per_course_within_window():
+    async def scenario():
+        manager = RecordingManager()
+        coalescer = service.BroadcastCoalescer(manager, window=0.05)
+        for i in range(10):
+            await coalescer.broadcast({"type": "course_updated", "course_id": "1", "data": {"price": i}})
+        await coalescer.broadcast({"type": "course_updated", "course_id": "2", "data": {"title": "New"}})
+        await coalescer.broadcast({"type": "course_updated", "course_id": "2", "data": {"price": 3}})
+        assert manager.sent == []
+        await asyncio.sleep(0.1)
+
+        await coalescer.broadcast({"type": "course_updated", "course_id": "1", "data": {"price": 99}})
+        await asyncio.sleep(0.1)
+        return manager, coalescer.stats()
+
+    manager, stats = asyncio.run(scenario())
+    (batch, topics), (single, single_topics) = manager.sent
+    assert batch["type"] == "courses_updated" and batch["count"] == 2
+    assert [(u["course_id"], u["data"], u["coalesced"]) for u in batch["updates"]] == [
+        ("1", {"price": 9}, 10), ("2", {"title": "New", "price": 3}, 2)
+    ]
+    assert {"course_updated", "course:1", "course:2"} <= topics
+    assert single["type"] == "course_updated" and single["data"] == {"price": 99} and single_topics is None
+    assert (stats["messages_in"], stats["frames_out"], stats["merged"]) == (13, 2, 10)
+
+def test_coalescer_flushes_pending_updates_before_other_events():
+    async def scenario():
+        manager = RecordingManager()
+        coalescer = service.BroadcastCoalescer(manager, window=10)
+        await coalescer.broadcast({"type": "course_updated", "course_id": "1", "data": {"price": 1}})
+        await coalescer.broadcast({"type": "course_deleted", "course_id": "1"})
+        await coalescer.close()
+        return [message["type"] for message, _ in manager.sent]
+
+    assert asyncio.run(scenario()) == ["course_updated", "course_deleted"]
+
+# ================================
+# WEBSOCKET RESUME
+# ================================
+
+def test_resume_replays_only_the_missed_events():
+    async def scenario():
+        manager = service.ConnectionManager(replay_buffer_size=5)
+        first = FakeWebSocket()
+        await manager.connect(first)
+        for i in range(3):
+            await manager.broadcast({"type": "course_created", "data": {"id": str(i), "subject": "Math"}})
+        await settle()
+        last = json.loads(first.frames[-1])
+        manager.disconnect(first)
+
+        # Events broadcast while the dashboard was away
+        await manager.broadcast({"type": "course_created", "data": {"id": "3", "subject": "Math"}})
+        await manager.broadcast({"type": "course_created", "data": {"id": "4", "subject": "Art"}})
+
+        back = FakeWebSocket()
+        await manager.connect(back)
+        manager.subscribe(back, ["subject:Math"])
+        reply = manager.resume(back, last["seq"], last["epoch"])
+        await settle()
+        await manager.shutdown()
+        return last, reply, [json.loads(f) for f in back.frames]
+
+    last, reply, frames = asyncio.run(scenario())
+    assert last["seq"] == 3
+    assert (reply["type"], reply["replayed"], reply["seq"]) == ("resumed", 1, 5)
+    assert [(f["seq"], f["data"]["id"]) for f in frames] == [(4, "3")]
+
+def test_resume_asks_for_resync_when_gap_left_the_buffer():
+    async def scenario():
+        manager = service.ConnectionManager(replay_buffer_size=3)
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        for i in range(10):
+            await manager.broadcast({"type": "course_deleted", "course_id": str(i)})
+        epoch = manager.event_bus.epoch
+        replies = [
+            manager.resume(ws, 2, epoch)["type"],
+            manager.resume(ws, 7, "another-epoch")["type"],
+            manager.resume(ws, 7, epoch)["type"],
+        ]
+        stats = manager.stats()
+        await manager.shutdown()
+        return replies, stats
+
+    replies, stats = asyncio.run(scenario())
+    assert replies == ["resync_required", "resync_required", "resumed"]
+    assert stats["resyncs"] == 2 and stats["replay_buffer"]["oldest_seq"] == 8
+
+# ================================
+# WEBSOCKET HEARTBEAT
+# ================================
+
+def test_heartbeat_pings_then_reaps_half_open_and_idle_clients():
+    async def scenario():
+        manager = service.ConnectionManager(heartbeat_interval=20, pong_timeout=10, idle_timeout=100)
+        answering, silent, idle = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        for ws in (answering, silent, idle):
+            await manager.connect(ws)
+        now = time.monotonic()
+        manager.clients[idle].last_seen = now - 200
+
+        manager.check_heartbeats(now)
+        await settle()
+        await manager.handle_message(answering, json.dumps({"type": "pong"}))
+        manager.check_heartbeats(now + 15)
+        await settle()
+        stats = manager.stats()
+        await manager.shutdown()
+        return answering, silent, idle, stats
+
+    answering, silent, idle, stats = asyncio.run(scenario())
+    assert json.loads(answering.frames[0])["type"] == "ping"
+    assert silent.closed_with == 1001 and idle.closed_with == 1001
+    assert answering.closed_with is None
+    assert stats["connections"] == 1
+    assert stats["reaped"] == {"idle": 1, "half_open": 1, "rate_limited": 0}
+
+def test_pong_replies_count_as_activity():
+    async def scenario():
+        manager = service.ConnectionManager(heartbeat_interval=0, idle_timeout=100)
+        ponging, silent = FakeWebSocket(), FakeWebSocket()
+        for ws in (ponging, silent):
+            await manager.connect(ws)
+        now = time.monotonic()
+        for ws in (ponging, silent):
+            manager.clients[ws].last_seen = now - 200
+        await manager.handle_message(ponging, json.dumps({"type": "pong"}))
+        manager.check_heartbeats(now)
+        await settle()
+        stats = manager.stats()
+        await manager.shutdown()
+        return ponging, silent, stats
+
+    ponging, silent, stats = asyncio.run(scenario())
+    assert ponging.closed_with is None and silent.closed_with == 1001
+    assert stats["reaped"]["idle"] == 1 and stats["reaped"]["half_open"] == 0
+
+def test_default_manager_neither_pings_nor_reaps_quiet_clients():
+    async def scenario():
+        manager = service.ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        manager.check_heartbeats(time.monotonic() + 3600)
+        await settle()
+        stats = manager.stats()
+        await manager.shutdown()
+        return ws, stats
+
+    ws, stats = asyncio.run(scenario())
+    assert ws.frames == [] and ws.closed_with is None
+    assert stats["reaped"] == {"idle": 0, "half_open": 0, "rate_limited": 0}
+
+def test_inbound_rate_limit_drops_then_disconnects():
+    async def scenario():
+        manager = service.ConnectionManager(inbound_rate=0.001, inbound_burst=3)
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        for _ in range(10):
+            await manager.handle_message(ws, json.dumps({"type": "ping"}))
+            await settle()
+        stats = manager.stats()
+        await manager.shutdown()
+        return ws, stats
+
+    ws, stats = asyncio.run(scenario())
+    assert [json.loads(f)["type"] for f in ws.frames] == ["pong"] * 3
+    assert stats["inbound_dropped"] >= 3
+    assert stats["reaped"]["rate_limited"] == 1 and ws.closed_with == 1008
+
+# ================================
+# DASHBOARD ASSETS
+# ================================
+
+def dashboard_client(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    (tmp_path / "dashboard").mkdir()
+    (tmp_path / "dashboard" / "app.js").write_text("console.log('dashboard');\n" * 50)
+    (tmp_path / "dashboard" / "index.html").write_text(
+        '<script src="/assets/vendor/vue.js"></script>'
+        '<script src="/assets/dashboard/app.js"></script>' + "<p>dashboard</p>\n" * 50
+    )
+    assets = service.DashboardAssets(str(tmp_path), fallbacks={"vendor/vue.js": "https://cdn.test/vue.js"})
+    monkeypatch.setattr(service, "dashboard_assets", assets)
+    return TestClient(service.app)
+
+def test_dashboard_negotiates_precompressed_variants(tmp_path, monkeypatch):
+    import gzip
+
+    client = dashboard_client(tmp_path, monkeypatch)
+
+    identity = client.get("/", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/", headers={"Accept-Encoding": "gzip, deflate"})
+    brotli = client.get("/", headers={"Accept-Encoding": "gzip;q=0.5, br"})
+    no_br = client.get("/", headers={"Accept-Encoding": "br;q=0, gzip"})
+
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert no_br.headers["content-encoding"] == "gzip"
+    assert brotli.headers["content-encoding"] == ("br" if service.brotli else "gzip")
+    assert gzipped.text == identity.text == brotli.text
+    assert len(gzip.compress(identity.content)) >= int(gzipped.headers["content-length"])
+    assert len({identity.headers["etag"], gzipped.headers["etag"]}) == 2
+    assert all(r.headers["vary"] == "Accept-Encoding" for r in (identity, gzipped, brotli))
+
+    # Missing vendored script falls back to the CDN, local assets get a version
+    assert 'src="https://cdn.test/vue.js"' in identity.text
+    assert re.search(r'src="/assets/dashboard/app\.js\?v=[0-9a-f]{12}"', identity.text)
+
+def test_dashboard_revalidates_with_etag_and_caches_assets(tmp_path, monkeypatch):
+    client = dashboard_client(tmp_path, monkeypatch)
+
+    page = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert page.headers["cache-control"] == "no-cache"
+    revalidated = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": page.headers["etag"]})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert revalidated.headers["etag"] == page.headers["etag"]
+
+    asset_url = re.search(r'src="(/assets/dashboard/app\.js\?v=\w+)"', page.text).group(1)
+    asset = client.get(asset_url)
+    assert asset.status_code == 200 and asset.text.startswith("console.log")
+    assert asset.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert asset.headers["content-type"].startswith("application/javascript")
+    assert client.get("/assets/dashboard/missing.js").status_code == 404
+
+# ================================
+# RESPONSE COMPRESSION
+# ================================
+
+def compression_client(**options):
+    from fastapi.testclient import TestClient
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse, StreamingResponse
+    from starlette.routing import Route
+
+    async def text(request):
+        size = int(request.query_params["size"])
+        media_type = request.query_params.get("type", "application/json")
+        return PlainTextResponse("x" * size, media_type=media_type, headers={"ETag": '"v1"'})
+
+    async def stream(request):
+        async def chunks():
+            for i in range(100):
+                yield json.dumps({"id": i, "description": "long course text " * 20}) + "\n"
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    app = Starlette(routes=[Route("/text", text), Route("/stream", stream)])
+    app.add_middleware(service.CompressionMiddleware, **options)
+    return TestClient(app)
+
+def test_compression_negotiates_and_respects_threshold():
+    client = compression_client(minimum_size=500)
+
+    small = client.get("/text?size=499", headers={"Accept-Encoding": "gzip"})
+    large = client.get("/text?size=5000", headers={"Accept-Encoding": "gzip"})
+    brotli = client.get("/text?size=5000", headers={"Accept-Encoding": "gzip;q=0.5, br"})
+    identity = client.get("/text?size=5000", headers={"Accept-Encoding": "identity"})
+    image = client.get("/text?size=5000&type=image/png", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in small.headers and small.headers["etag"] == '"v1"'
+    assert large.headers["content-encoding"] == "gzip" and large.text == "x" * 5000
+    assert int(large.headers["content-length"]) < 100
+    assert large.headers["vary"] == "Accept-Encoding" and large.headers["etag"] == 'W/"v1"'
+    assert brotli.headers["content-encoding"] == ("br" if service.brotli else "gzip")
+    assert brotli.text == "x" * 5000
+    assert "content-encoding" not in identity.headers
+    assert "content-encoding" not in image.headers
+
+def test_compression_streams_without_buffering():
+    client = compression_client(minimum_size=10 ** 9)
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        lines = [json.loads(line) for line in response.iter_lines()]
+        downloaded = response.num_bytes_downloaded
+
+    assert [line["id"] for line in lines] == list(range(100))
+    assert downloaded < sum(len(json.dumps(line)) for line in lines) / 10
+
+# ================================
+# CONDITIONAL GET
+# ================================
+
+def test_course_listing_answers_unchanged_polls_with_304(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    table = FakeCourseTable(course_row(i) for i in range(5))
+    monkeypatch.setattr(service, "admin_agent", make_agent(table))
+    client = TestClient(service.app)
+
+    first = client.get("/api/courses?limit=3")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"3-') and first.headers["cache-control"] == "no-cache"
+    assert "last-modified" not in first.headers
+
+    unchanged = client.get("/api/courses?limit=3", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304 and unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+    assert client.get("/api/courses?limit=4", headers={"If-None-Match": etag}).status_code == 200
+
+    table.insert(course_row(9))
+    service.admin_agent.course_cache.invalidate()
+    changed = client.get("/api/courses?limit=3", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()["data"][0]["id"] == "00000009"
+    assert changed.headers["etag"] != etag
+
+def test_course_listing_ignores_if_modified_since_after_a_delete(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    table = FakeCourseTable(course_row(i) for i in range(5))
+    monkeypatch.setattr(service, "admin_agent", make_agent(table))
+    client = TestClient(service.app)
+
+    since = "Mon, 01 Jan 2024 00:00:04 GMT"  # newest updated_at, unchanged by the delete
+    assert client.get("/api/courses", headers={"If-Modified-Since": since}).status_code == 200
+    table.rows = [row for row in table.rows if row["id"] != "00000002"]
+    service.admin_agent.course_cache.invalidate()
+    after_delete = client.get("/api/courses", headers={"If-Modified-Since": since})
+    assert after_delete.status_code == 200
+    assert "00000002" not in [course["id"] for course in after_delete.json()["data"]]
+
+def test_course_listing_passes_price_and_order_parameters_through(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request)
+        return httpx.Response(200, json=[course_row(1)])
+
+    monkeypatch.setattr(service, "admin_agent", make_agent(handler))
+    client = TestClient(service.app)
+
+    ok = client.get("/api/courses?min_price=10&max_price=0&order_by=price&order_direction=asc")
+    assert ok.json()["success"] is True
+    assert requests[-1].url.params.get_list("price") == ["gte.10.0", "lte.0.0"]
+    assert requests[-1].url.params["order"] == "price.asc"
+
+    client.get("/api/courses?min_price=10&max_price=0&order_by=title&order_direction=asc")
+    assert len(requests) == 2 and requests[-1].url.params["order"] == "title.asc"
+
+    for query in ("order_by=id;drop", "order_by=password", "order_direction=sideways"):
+        rejected = client.get(f"/api/courses?{query}")
+        assert rejected.json()["code"] == "VALIDATION_ERROR"
+    assert len(requests) == 2
+
+def test_course_item_answers_conditional_get_and_404(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    table = FakeCourseTable(course_row(i) for i in range(3))
+    monkeypatch.setattr(service, "admin_agent", make_agent(table))
+    client = TestClient(service.app)
+
+    first = client.get("/api/courses/00000001")
+    assert first.status_code == 200 and first.json()["data"]["title"] == "Course 1"
+    etag = first.headers["etag"]
+    last_modified = first.headers["last-modified"]
+    assert etag.startswith('W/"1-') and last_modified == "Mon, 01 Jan 2024 00:00:01 GMT"
+    unchanged = client.get("/api/courses/00000001", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304 and unchanged.content == b""
+    assert client.get("/api/courses/00000001", headers={"If-Modified-Since": last_modified}).status_code == 304
+    # If-None-Match wins over If-Modified-Since
+    assert client.get("/api/courses/00000001", headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified}).status_code == 200
+    assert client.get("/api/courses/00000002", headers={"If-None-Match": etag}).status_code == 200
+
+    table.rows[1] = {**course_row(1), "updated_at": "2024-02-01T00:00:00+00:00"}
+    service.admin_agent.course_cache.invalidate()
+    assert client.get("/api/courses/00000001", headers={"If-None-Match": etag}).status_code == 200
+    missing = client.get("/api/courses/99999999")
+    assert missing.status_code == 404 and missing.json()["code"] == "NOT_FOUND"
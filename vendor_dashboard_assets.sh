@@ -0,0 +1,17 @@
+#!/bin/bash
+# Download the dashboard's third-party scripts into static/vendor so the
+# dashboard is served entirely from this host (no CDN at page load).
+# Until this has run, the dashboard falls back to the CDN copy.
+
+set -e
+
+VENDOR_DIR="$(cd "$(dirname "$0")" && pwd)/static/vendor"
+VUE_VERSION="3.4.15"
+
+mkdir -p "$VENDOR_DIR"
+
+echo "📦 Vendoring Vue $VUE_VERSION..."
+curl -fsSL "https://unpkg.com/vue@$VUE_VERSION/dist/vue.global.prod.js" -o "$VENDOR_DIR/vue.global.prod.js"
+
+echo "✅ Vendored assets:"
+ls -l "$VENDOR_DIR"